@@ -0,0 +1,532 @@
+"""Offline load tests for bot.py.
+
+Replays synthetic workloads through the real event handlers and slash
+command callbacks against in-process fakes of the Discord objects they
+touch, so no token or gateway connection is needed. Each scenario prints
+one JSON object per line:
+
+    python bench.py                          # all scenarios at 2000 events/s
+    python bench.py -s on_message -n 20000 -r 5000
+    python bench.py -r 0                     # one burst, as fast as possible
+    python bench.py --output bench_output.txt
+    python bench.py --compare baseline.txt   # exit 1 if a scenario regressed
+
+Outbound REST calls are counted per route instead of being sent. Per-channel
+send pacing is disabled unless --real-pacing is given, so runs measure the
+bot's own overhead rather than Discord's rate limits. Latency is timed from
+when each event's task starts running; in a burst (-r 0) it also includes
+waiting behind the rest of the burst, so compare bursts only with bursts.
+"""
+import os
+
+os.environ.setdefault('STATE_BACKEND', 'memory')
+os.environ.setdefault('STATE_FLUSH_INTERVAL', '3600')
+
+import argparse
+import asyncio
+import copy
+import itertools
+import json
+import random
+import sys
+import time
+from collections import Counter
+
+import discord
+
+import bot as botmod
+import core.dispatch
+from core.state import GLOBAL_SCOPE
+from core.utils import current_rss
+
+bot = botmod.bot
+_ids = itertools.count(1 << 32)
+
+def next_id():
+    return next(_ids)
+
+class FakeHTTP:
+    """Counts the REST calls the fakes would have made, per route."""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.latency = 0.0
+
+    async def request(self, route):
+        self.calls[route] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+class FakeRole:
+    def __init__(self, guild, role_id=None, name="role"):
+        self.guild = guild
+        self.id = role_id or next_id()
+        self.name = name
+        self.mention = f"<@&{self.id}>"
+
+    def is_default(self):
+        return self.id == self.guild.id
+
+class FakeMessage:
+    def __init__(self, world, channel, author, content="", mentions=(), message_id=None):
+        self.world = world
+        self.id = message_id or next_id()
+        self.channel = channel
+        self.guild = channel.guild
+        self.author = author
+        self.content = content
+        self.mentions = list(mentions)
+        self.attachments = []
+        self.embeds = []
+        self.reactions = []
+        self.jump_url = f"https://discord.com/channels/{self.guild.id}/{channel.id}/{self.id}"
+
+    async def edit(self, **kwargs):
+        await self.world.http.request('PATCH /messages')
+        return self
+
+    async def delete(self):
+        await self.world.http.request('DELETE /messages')
+
+class FakeReaction:
+    def __init__(self, emoji, count):
+        self.emoji = emoji
+        self.count = count
+
+class FakeChannel:
+    def __init__(self, world, guild, name):
+        self.world = world
+        self.guild = guild
+        self.id = next_id()
+        self.name = name
+        self.mention = f"<#{self.id}>"
+        self.category = None
+        self.messages = {}
+
+    async def send(self, content=None, **kwargs):
+        await self.world.http.request('POST /messages')
+        message = FakeMessage(self.world, self, self.world.bot_user, content or "")
+        self.messages[message.id] = message
+        return message
+
+    async def fetch_message(self, message_id):
+        await self.world.http.request('GET /messages')
+        message = self.messages.get(message_id)
+        if message is None:
+            raise discord.NotFound(FakeResponse(404), "Unknown Message")
+        return message
+
+    def get_partial_message(self, message_id):
+        return self.messages.get(message_id) or FakeMessage(self.world, self, self.world.bot_user, message_id=message_id)
+
+class FakePartialMessageable:
+    """Like discord.PartialMessageable: only the ids, no name, mention or guild object."""
+
+    def __init__(self, channel, guild_id=None):
+        self._channel = channel
+        self.id = channel.id
+        self.guild_id = guild_id
+
+    def _bind(self, message):
+        # Messages reached through a partial messageable only know the partial channel
+        message = copy.copy(message)
+        message.channel = self
+        return message
+
+    async def send(self, content=None, **kwargs):
+        return self._bind(await self._channel.send(content, **kwargs))
+
+    async def fetch_message(self, message_id):
+        return self._bind(await self._channel.fetch_message(message_id))
+
+    def get_partial_message(self, message_id):
+        return self._bind(self._channel.get_partial_message(message_id))
+
+class FakeResponse:
+    def __init__(self, status):
+        self.status = status
+        self.reason = "fake"
+
+class FakeAsset:
+    def __init__(self, url):
+        self.url = url
+
+class FakeMember:
+    def __init__(self, world, guild, name, is_bot=False):
+        self.world = world
+        self.guild = guild
+        self.id = next_id()
+        self.name = name
+        self.display_name = name
+        self.mention = f"<@{self.id}>"
+        self.bot = is_bot
+        self.status = discord.Status.online
+        self.roles = [guild.default_role]
+        self.display_avatar = FakeAsset(f"https://cdn.example/avatars/{self.id}.png")
+
+    def __str__(self):
+        return self.name
+
+    async def add_roles(self, *roles, reason=None):
+        await self.world.http.request('PUT /member/roles')
+        self.roles.extend(roles)
+
+class FakeGuild:
+    def __init__(self, world, name):
+        self.world = world
+        self.id = next_id()
+        self.name = name
+        self.default_role = FakeRole(self, self.id, "@everyone")
+        self.roles = {self.id: self.default_role}
+        self.channels = {}
+        self.member_count = 0
+        self.chunked = True
+
+    def add_channel(self, name):
+        channel = FakeChannel(self.world, self, name)
+        self.channels[channel.id] = channel
+        self.world.channels[channel.id] = channel
+        return channel
+
+    def add_role(self, name):
+        role = FakeRole(self, name=name)
+        self.roles[role.id] = role
+        return role
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    def get_role(self, role_id):
+        return self.roles.get(role_id)
+
+class FakeInteractionResponse:
+    def __init__(self, world):
+        self.world = world
+        self.done = False
+
+    def is_done(self):
+        return self.done
+
+    async def send_message(self, content=None, **kwargs):
+        self.done = True
+        await self.world.http.request('POST /interactions/callback')
+
+    async def defer(self, **kwargs):
+        self.done = True
+        await self.world.http.request('POST /interactions/callback')
+
+class FakeFollowup:
+    def __init__(self, world):
+        self.world = world
+
+    async def send(self, content=None, **kwargs):
+        await self.world.http.request('POST /webhooks')
+
+class FakeInteraction:
+    def __init__(self, world, channel, user):
+        self.id = next_id()
+        self.guild = channel.guild
+        self.guild_id = channel.guild.id
+        self.channel = channel
+        self.channel_id = channel.id
+        self.user = user
+        self.permissions = discord.Permissions.all()
+        self.response = FakeInteractionResponse(world)
+        self.followup = FakeFollowup(world)
+
+class FakeReactionPayload:
+    def __init__(self, message, member, emoji):
+        self.guild_id = message.guild.id
+        self.channel_id = message.channel.id
+        self.message_id = message.id
+        self.member = member
+        self.emoji = emoji
+
+class World:
+    """A small fake Discord: guilds with channels, members and an HTTP counter."""
+
+    def __init__(self, guilds=4, channels=8, members=200):
+        self.http = FakeHTTP()
+        self.channels = {}
+        self.guilds = []
+        self.bot_user = None
+        for g in range(guilds):
+            guild = FakeGuild(self, f"guild-{g}")
+            self.guilds.append(guild)
+            guild.text_channels = [guild.add_channel(f"chan-{c}") for c in range(channels)]
+            guild.members = [FakeMember(self, guild, f"user-{g}-{m}") for m in range(members)]
+            guild.member_count = members
+            guild.auto_role = guild.add_role("newcomer")
+        self.bot_user = FakeMember(self, self.guilds[0], "bot", is_bot=True)
+
+    def channel(self, channel_id, guild_id=None, type=None):
+        return FakePartialMessageable(self.channels[channel_id], guild_id)
+
+    def random_member(self, guild):
+        return random.choice(guild.members)
+
+    def install(self):
+        bot.get_partial_messageable = self.channel
+        bot.get_channel = lambda channel_id: self.channels.get(channel_id)
+
+        async def process_commands(message):
+            # The bot has no prefix commands; skip discord.py's context parsing
+            return None
+
+        bot.process_commands = process_commands
+
+class LoopLagSampler:
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.lags = []
+        self.task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lags.append(loop.time() - start - self.interval)
+
+    def start(self):
+        self.task = asyncio.create_task(self._run())
+
+    def stop(self):
+        self.task.cancel()
+
+def listeners(name):
+    """Return a coroutine function running every cog listener for an event, like bot.dispatch."""
+    handlers = list(bot.extra_events.get(name, []))
+
+    async def handle(*args):
+        await asyncio.gather(*(handler(*args) for handler in handlers))
+    return handle
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+async def drain():
+    """Wait until the outbound queues and debounced updates have settled."""
+    for _ in range(1000):
+        await asyncio.sleep(0.01)
+        refresher = bot.get_cog('Starboard').starboard.refresher
+        if not bot.outbound.queues and not refresher.pending and not refresher.running:
+            return
+
+async def run_scenario(name, world, make_event, events, rate):
+    loop = asyncio.get_running_loop()
+    latencies = []
+    world.http.calls.clear()
+    sampler = LoopLagSampler()
+    rss_before = current_rss()
+    sampler.start()
+
+    async def timed(coro):
+        start = time.perf_counter()
+        await coro
+        latencies.append(time.perf_counter() - start)
+
+    tasks = []
+    start = loop.time()
+    for i in range(events):
+        if rate:
+            # Yield even when behind schedule so events never pile up into a burst
+            await asyncio.sleep(max(start + i / rate - loop.time(), 0))
+        elif i % 500 == 0:
+            await asyncio.sleep(0)
+        # Like discord.py's dispatch, each event runs in its own task
+        tasks.append(asyncio.create_task(timed(make_event(i))))
+    await asyncio.gather(*tasks)
+    elapsed = loop.time() - start
+    await drain()
+    sampler.stop()
+    rss_after = current_rss()
+
+    return {
+        'scenario': name,
+        'events': events,
+        'rate': rate,
+        'seconds': round(elapsed, 4),
+        'throughput': round(events / elapsed, 1) if elapsed else None,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 4),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 4),
+        'max_ms': round(max(latencies, default=0) * 1000, 4),
+        'loop_lag_p99_ms': round(percentile(sampler.lags, 99) * 1000, 3),
+        'loop_lag_max_ms': round(max(sampler.lags, default=0) * 1000, 3),
+        'outbound_requests': sum(world.http.calls.values()),
+        'outbound_by_route': dict(world.http.calls),
+        'outbound_queue': bot.outbound.stats(),
+        'rss_delta_kb': (rss_after - rss_before) // 1024 if rss_before and rss_after else None,
+    }
+
+def on_message_scenario(world):
+    # A mix of chatter, custom commands and AFK mentions
+    for guild in world.guilds:
+        bot.get_cog('CustomCommands').custom_commands.add(guild.id, 'hello', 'Hello {mention}! You said: {args}', ['hi'])
+        for member in guild.members[:5]:
+            bot.get_cog('Afk').afk_users.set(guild.id, member.id, 'lunch')
+    handler = listeners('on_message')
+
+    def make(i):
+        guild = world.guilds[i % len(world.guilds)]
+        channel = guild.text_channels[i % len(guild.text_channels)]
+        author = world.random_member(guild)
+        roll = i % 10
+        if roll == 0:
+            content, mentions = "!hello there", []
+        elif roll == 1:
+            content, mentions = "ping afk people", guild.members[:3]
+        else:
+            content, mentions = f"just chatting {i}", []
+        return handler(FakeMessage(world, channel, author, content, mentions))
+    return make
+
+def starboard_scenario(world):
+    starboard = bot.get_cog('Starboard').starboard
+    emoji = bot.extensions['cogs.starboard'].STARBOARD_EMOJI
+    targets = []
+    for guild in world.guilds:
+        board = guild.text_channels[-1]
+        starboard.config[guild.id] = {'channel': board.id, 'threshold': 3}
+        for channel in guild.text_channels[:-1]:
+            message = FakeMessage(world, channel, world.random_member(guild), "a starred post")
+            message.reactions = [FakeReaction(emoji, 0)]
+            channel.messages[message.id] = message
+            targets.append(message)
+    starboard.refresher.delay = 0.05
+    handler = listeners('on_raw_reaction_add')
+
+    def make(i):
+        message = targets[i % len(targets)]
+        message.reactions[0].count += 1
+        return handler(FakeReactionPayload(message, world.random_member(message.guild), emoji))
+    return make
+
+def member_join_scenario(world):
+    # Keep burst coalescing on, but with a window short enough to settle between scenarios
+    # The extension module, not a fresh import of cogs.members, holds the constant the cog reads
+    bot.extensions['cogs.members'].JOIN_BURST_WINDOW = 0.05
+    members = bot.get_cog('Members')
+    for guild in world.guilds:
+        members.auto_roles[guild.id] = guild.auto_role.id
+        members.welcome_messages.set(guild.id, guild.text_channels[0].id, "Welcome {member.mention} to {server}! You are member #{count}.")
+    handler = listeners('on_member_join')
+
+    def make(i):
+        guild = world.guilds[i % len(world.guilds)]
+        guild.member_count += 1
+        return handler(FakeMember(world, guild, f"raider-{i}"))
+    return make
+
+def reminders_scenario(world):
+    reminders = bot.get_cog('Reminders').reminders
+    scheduler = reminders.scheduler
+    waiting = {}
+    callback = scheduler.callback
+
+    async def notifying_callback(key):
+        await callback(key)
+        waiting.pop(key).set_result(None)
+    scheduler.callback = notifying_callback
+
+    async def fire(i):
+        guild = world.guilds[i % len(world.guilds)]
+        channel = guild.text_channels[i % len(guild.text_channels)]
+        reminder = reminders.add(world.random_member(guild).id, guild.id, channel.id, time.time(), f"reminder {i}")
+        # Latency here is add-to-delivery
+        waiting[reminder['id']] = asyncio.get_running_loop().create_future()
+        await waiting[reminder['id']]
+
+    return fire
+
+def slash_commands_scenario(world):
+    commands = [
+        (bot.tree.get_command('coinflip'), {}),
+        (bot.tree.get_command('roll'), {'dice': '3d6'}),
+        (bot.tree.get_command('choose'), {'choices': 'a, b, c'}),
+        (bot.tree.get_command('remind').get_command('set'), {'time': '30m', 'message': 'stretch'}),
+        (bot.tree.get_command('todo').get_command('add'), {'item': 'write benchmarks'}),
+        (bot.tree.get_command('afk'), {'reason': 'bench'}),
+        (bot.tree.get_command('poll'), {'question': 'Best fruit?', 'options': 'apple, pear, plum'}),
+    ]
+
+    def make(i):
+        command, kwargs = commands[i % len(commands)]
+        guild = world.guilds[i % len(world.guilds)]
+        channel = guild.text_channels[i % len(guild.text_channels)]
+        interaction = FakeInteraction(world, channel, world.random_member(guild))
+        return command.callback(command.binding, interaction, **kwargs)
+    return make
+
+SCENARIOS = {
+    'on_message': on_message_scenario,
+    'on_raw_reaction_add': starboard_scenario,
+    'on_member_join': member_join_scenario,
+    'reminders': reminders_scenario,
+    'slash_commands': slash_commands_scenario,
+}
+
+def compare(results, baseline_path, tolerance):
+    """Return the scenarios whose p99 or throughput regressed beyond tolerance."""
+    baseline = {}
+    with open(baseline_path) as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                baseline[entry['scenario']] = entry
+    regressions = []
+    for result in results:
+        base = baseline.get(result['scenario'])
+        if base is None:
+            continue
+        if result['p99_ms'] > base['p99_ms'] * (1 + tolerance):
+            regressions.append(f"{result['scenario']}: p99 {base['p99_ms']}ms -> {result['p99_ms']}ms")
+        if base['throughput'] and result['throughput'] and result['throughput'] < base['throughput'] * (1 - tolerance):
+            regressions.append(f"{result['scenario']}: throughput {base['throughput']}/s -> {result['throughput']}/s")
+    return regressions
+
+async def main(args):
+    random.seed(args.seed)
+    if not args.real_pacing:
+        core.dispatch.SEND_BUCKET_WINDOW = 0
+    world = World(guilds=args.guilds, channels=args.channels, members=args.members)
+    world.http.latency = args.http_latency / 1000
+    world.install()
+    await bot.state.load_scope(GLOBAL_SCOPE)
+    await bot.load_extensions()
+
+    results = []
+    for name in args.scenario or SCENARIOS:
+        make_event = SCENARIOS[name](world)
+        result = await run_scenario(name, world, make_event, args.events, args.rate)
+        results.append(result)
+        print(json.dumps(result), flush=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-s', '--scenario', action='append', choices=sorted(SCENARIOS), help="Scenario to run (repeatable, default all)")
+    parser.add_argument('-n', '--events', type=int, default=5000, help="Events per scenario")
+    parser.add_argument('-r', '--rate', type=float, default=2000, help="Events per second (0 = one burst, as fast as possible)")
+    parser.add_argument('--guilds', type=int, default=4)
+    parser.add_argument('--channels', type=int, default=8)
+    parser.add_argument('--members', type=int, default=200)
+    parser.add_argument('--http-latency', type=float, default=0, help="Simulated REST latency in ms")
+    parser.add_argument('--real-pacing', action='store_true', help="Keep the per-channel send pacing")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Write JSON lines here as well as to stdout")
+    parser.add_argument('--compare', help="Baseline JSON lines file to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed relative regression for --compare")
+    sys.exit(asyncio.run(main(parser.parse_args())))
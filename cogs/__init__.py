@@ -0,0 +1 @@
+"""Feature extensions, loaded by name from ModernBot.EXTENSIONS."""
@@ -0,0 +1,41 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+class Admin(commands.Cog):
+    """Owner-only maintenance commands."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        if await interaction.client.is_owner(interaction.user):
+            return True
+        await interaction.response.send_message("Only the bot owner can use this command.", ephemeral=True)
+        return False
+
+    @app_commands.command(name="reload", description="Reload one extension without reconnecting")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.describe(extension="Extension to reload, e.g. cogs.polls")
+    async def reload(self, interaction: discord.Interaction, extension: str):
+        await interaction.response.defer(ephemeral=True)
+        try:
+            timings = await self.bot.load_feature(extension, reload=True)
+        except commands.ExtensionError as e:
+            await interaction.followup.send(f"Reload of {extension} failed: {e}", ephemeral=True)
+            return
+        await interaction.followup.send(
+            f"Reloaded {extension}: import {timings['import'] * 1000:.0f}ms, setup {timings['setup'] * 1000:.0f}ms"
+            + (f", ready after {timings['ready'] * 1000:.0f}ms" if timings['ready'] is not None else ""),
+            ephemeral=True
+        )
+
+    @reload.autocomplete('extension')
+    async def reload_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name in self.bot.EXTENSIONS if current.lower() in name
+        ][:25]
+
+async def setup(bot):
+    await bot.add_cog(Admin(bot))
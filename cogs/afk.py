@@ -0,0 +1,76 @@
+import time
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+AFK_NOTICE_COOLDOWN = 300
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    for unit, size in (('d', 86400), ('h', 3600), ('m', 60)):
+        if seconds >= size:
+            return f"{seconds // size}{unit}"
+    return f"{seconds}s"
+
+class AfkTracker:
+    """Per-guild AFK state plus a cooldown on repeated notices per channel."""
+
+    def __init__(self, table, notified=None):
+        self.table = table
+        self.notified = notified if notified is not None else {}
+
+    def set(self, guild_id, user_id, reason):
+        self.table[(guild_id, user_id)] = {'reason': reason, 'since': time.time()}
+
+    def notices(self, message):
+        """Build the combined AFK reply for a message, clearing the author's AFK status."""
+        guild_id = message.guild.id
+        # Never wait on storage here; a guild still loading has no AFK users yet
+        if not self.table.store.request_scope(guild_id) or not self.table:
+            return None
+        now = time.time()
+        lines = []
+        status = self.table.pop((guild_id, message.author.id), None)
+        if status is not None:
+            lines.append(f"Welcome back, {message.author.mention}! I've removed your AFK status (AFK for {format_duration(now - status['since'])}).")
+        for member in message.mentions:
+            status = self.table.get((guild_id, member.id))
+            if status is None:
+                continue
+            key = (message.channel.id, member.id)
+            if now - self.notified.get(key, 0) < AFK_NOTICE_COOLDOWN:
+                continue
+            self.notified[key] = now
+            lines.append(f"{member.display_name} is AFK: {status['reason']} (AFK for {format_duration(now - status['since'])})")
+        if len(self.notified) > 10000:
+            self.notified = {k: t for k, t in self.notified.items() if now - t < AFK_NOTICE_COOLDOWN}
+        return "\n".join(lines) if lines else None
+
+class Afk(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        # Keep the notice cooldowns so a reload does not repeat recent notices
+        carried = bot.carryover.pop(self.qualified_name, {})
+        self.afk_users = AfkTracker(bot.state.table('afk', per_guild=True), carried.get('notified'))
+
+    async def cog_unload(self):
+        self.bot.carryover[self.qualified_name] = {'notified': self.afk_users.notified}
+
+    # 21. AFK System
+    @app_commands.command(name="afk", description="Set your AFK status")
+    @app_commands.guild_only()
+    async def afk(self, interaction: discord.Interaction, reason: str = "AFK"):
+        self.afk_users.set(interaction.guild.id, interaction.user.id, reason)
+        await interaction.response.send_message(f"{interaction.user.mention} is now AFK: {reason}")
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        if message.author.bot or message.guild is None:
+            return
+        afk_notice = self.afk_users.notices(message)
+        if afk_notice:
+            self.bot.outbound.send(message.channel, afk_notice, allowed_mentions=discord.AllowedMentions(users=[message.author]))
+
+async def setup(bot):
+    await bot.add_cog(Afk(bot))
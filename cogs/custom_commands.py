@@ -0,0 +1,156 @@
+import re
+from types import MappingProxyType
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from core.utils import compile_template
+
+CUSTOM_COMMAND_PREFIX = '!'
+CUSTOM_COMMAND_NAME = re.compile(r'[a-z0-9_-]{1,32}')
+CUSTOM_COMMAND_FIELDS = {'args', 'user', 'mention', 'channel', 'server'} | {str(i) for i in range(1, 10)}
+NO_COMMANDS = MappingProxyType({})
+
+def normalize_command_name(name):
+    name = name.strip().lower().removeprefix(CUSTOM_COMMAND_PREFIX)
+    if not CUSTOM_COMMAND_NAME.fullmatch(name):
+        raise ValueError("Command names must be 1-32 letters, digits, '-' or '_'.")
+    return name
+
+def render_template(parts, message, args):
+    words = args.split()
+    out = []
+    for is_field, value in parts:
+        if not is_field:
+            out.append(value)
+        elif value == 'args':
+            out.append(args)
+        elif value == 'user':
+            out.append(message.author.display_name)
+        elif value == 'mention':
+            out.append(message.author.mention)
+        elif value == 'channel':
+            out.append(message.channel.mention)
+        elif value == 'server':
+            out.append(message.guild.name)
+        else:
+            i = int(value) - 1
+            out.append(words[i] if i < len(words) else '')
+    return ''.join(out)
+
+class CustomCommandRegistry:
+    """Per-guild custom commands compiled into immutable trigger tables.
+
+    The stored definitions are ``{name: {'response': str, 'aliases': [...]}}``
+    per guild. Every change rebuilds that guild's trigger -> template table
+    and swaps it in with a single assignment, so ``on_message`` only ever
+    reads a finished table.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.compiled = {}
+
+    def commands(self, guild_id):
+        return self.table.get(guild_id, {})
+
+    def lookup(self, guild_id):
+        compiled = self.compiled.get(guild_id)
+        if compiled is None:
+            if not self.table.store.request_scope(guild_id):
+                # Still loading; compiling now would cache an empty table for good
+                return NO_COMMANDS
+            compiled = self._compile(guild_id)
+        return compiled
+
+    def _compile(self, guild_id):
+        triggers = {}
+        for name, command in self.commands(guild_id).items():
+            parts = compile_template(command['response'], CUSTOM_COMMAND_FIELDS)
+            triggers[name] = parts
+            for alias in command['aliases']:
+                triggers[alias] = parts
+        compiled = MappingProxyType(triggers) if triggers else NO_COMMANDS
+        self.compiled[guild_id] = compiled
+        return compiled
+
+    def add(self, guild_id, name, response, aliases=()):
+        name = normalize_command_name(name)
+        aliases = sorted({normalize_command_name(alias) for alias in aliases} - {name})
+        compile_template(response, CUSTOM_COMMAND_FIELDS)
+        commands = dict(self.commands(guild_id))
+        commands.pop(name, None)
+        taken = set(commands).union(*(other['aliases'] for other in commands.values()))
+        clashes = taken & {name, *aliases}
+        if clashes:
+            raise ValueError(f"Already used by another command: {', '.join(sorted(clashes))}")
+        commands[name] = {'response': response, 'aliases': aliases}
+        self.table[guild_id] = commands
+        self._compile(guild_id)
+        return name
+
+    def remove(self, guild_id, name):
+        name = normalize_command_name(name)
+        commands = dict(self.commands(guild_id))
+        if commands.pop(name, None) is None:
+            return False
+        if commands:
+            self.table[guild_id] = commands
+        else:
+            del self.table[guild_id]
+        self._compile(guild_id)
+        return True
+
+    def render(self, message):
+        content = message.content
+        name, _, args = content[len(CUSTOM_COMMAND_PREFIX):].partition(' ')
+        parts = self.lookup(message.guild.id).get(name.lower())
+        if parts is None:
+            return None
+        return render_template(parts, message, args.strip())
+
+class CustomCommands(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.custom_commands = CustomCommandRegistry(bot.state.table('custom_commands', per_guild=True))
+
+    # 19. Custom Commands
+    @app_commands.command(name="add_command", description="Add a custom command")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    @app_commands.describe(
+        response="Placeholders: {args}, {1}-{9}, {user}, {mention}, {channel}, {server}",
+        aliases="Other names for the command, separated by commas"
+    )
+    async def add_command(self, interaction: discord.Interaction, command_name: str, response: str, aliases: str = None):
+        alias_list = [alias for alias in aliases.split(',') if alias.strip()] if aliases else []
+        try:
+            name = self.custom_commands.add(interaction.guild.id, command_name, response, alias_list)
+        except ValueError as e:
+            await interaction.response.send_message(str(e), ephemeral=True)
+            return
+        await interaction.response.send_message(f"Custom command '{CUSTOM_COMMAND_PREFIX}{name}' added successfully.")
+
+    @app_commands.command(name="remove_command", description="Remove a custom command")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    async def remove_command(self, interaction: discord.Interaction, command_name: str):
+        try:
+            removed = self.custom_commands.remove(interaction.guild.id, command_name)
+        except ValueError:
+            removed = False
+        if removed:
+            await interaction.response.send_message(f"Custom command '{command_name}' removed successfully.")
+        else:
+            await interaction.response.send_message(f"Custom command '{command_name}' not found.")
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        if message.author.bot or message.guild is None:
+            return
+        if message.content.startswith(CUSTOM_COMMAND_PREFIX):
+            response = self.custom_commands.render(message)
+            if response:
+                self.bot.outbound.send(message.channel, response, allowed_mentions=discord.AllowedMentions(everyone=False, roles=False))
+
+async def setup(bot):
+    await bot.add_cog(CustomCommands(bot))
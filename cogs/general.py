@@ -0,0 +1,77 @@
+import random
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+class General(commands.Cog):
+    """Small utility commands with no state of their own."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    # 1. Ping Command
+    @app_commands.command(name="ping", description="Check the bot's latency")
+    async def ping(self, interaction: discord.Interaction):
+        latency = round(self.bot.latency * 1000)
+        stats = self.bot.outbound.stats()
+        await interaction.response.send_message(f"Pong! Latency: {latency}ms | Send queue: {stats['queued']} (avg wait {stats['avg_wait'] * 1000:.0f}ms)")
+
+    # 4. Avatar Command
+    @app_commands.command(name="avatar", description="Get a user's avatar")
+    async def avatar(self, interaction: discord.Interaction, member: discord.Member = None):
+        member = member or interaction.user
+        embed = discord.Embed(title=f"{member.name}'s Avatar")
+        embed.set_image(url=member.avatar.url if member.avatar else member.default_avatar.url)
+        await interaction.response.send_message(embed=embed)
+
+    # 5. Say Command
+    @app_commands.command(name="say", description="Make the bot say something")
+    @app_commands.checks.has_permissions(manage_messages=True)
+    async def say(self, interaction: discord.Interaction, message: str):
+        await interaction.response.send_message(message)
+
+    # 9. Random Choice Command
+    @app_commands.command(name="choose", description="Make a random choice")
+    async def choose(self, interaction: discord.Interaction, choices: str):
+        options = [choice.strip() for choice in choices.split(',')]
+        if len(options) < 2:
+            await interaction.response.send_message("Please provide at least two choices separated by commas.")
+        else:
+            chosen = random.choice(options)
+            await interaction.response.send_message(f"I choose: {chosen}")
+
+    # 10. Coin Flip Command
+    @app_commands.command(name="coinflip", description="Flip a coin")
+    async def coinflip(self, interaction: discord.Interaction):
+        result = random.choice(["Heads", "Tails"])
+        await interaction.response.send_message(f"The coin landed on: {result}")
+
+    # 11. Roll Dice Command
+    @app_commands.command(name="roll", description="Roll dice (e.g., 2d6)")
+    async def roll(self, interaction: discord.Interaction, dice: str):
+        try:
+            num_dice, num_sides = map(int, dice.lower().split('d'))
+            if num_dice > 100 or num_sides > 100:
+                await interaction.response.send_message("Please use a reasonable number of dice and sides (max 100 each).")
+                return
+            rolls = [random.randint(1, num_sides) for _ in range(num_dice)]
+            total = sum(rolls)
+            await interaction.response.send_message(f"Rolls: {rolls}\nTotal: {total}")
+        except ValueError:
+            await interaction.response.send_message("Invalid dice format. Use 'NdM' where N is the number of dice and M is the number of sides.")
+
+    # 14. Member Counter
+    @app_commands.command(name="member_count", description="Display the current member count")
+    async def member_count(self, interaction: discord.Interaction):
+        await interaction.response.send_message(f"Current member count: {interaction.guild.member_count}")
+
+    # 16. Server Rules
+    @app_commands.command(name="rules", description="Display server rules")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    async def rules(self, interaction: discord.Interaction, *, rules_text: str):
+        embed = discord.Embed(title="Server Rules", description=rules_text, color=discord.Color.blue())
+        await interaction.response.send_message(embed=embed)
+
+async def setup(bot):
+    await bot.add_cog(General(bot))
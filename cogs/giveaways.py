@@ -0,0 +1,223 @@
+import base64
+import bisect
+import random
+import time
+from array import array
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from core.config import owns_guild
+from core.scheduling import DeadlineScheduler, Debouncer
+
+GIVEAWAY_EDIT_DELAY = 5
+# Entries are persisted in append-only chunks of this many ids
+GIVEAWAY_ENTRY_CHUNK = 1024
+
+def _encode_entries(entries):
+    return base64.b64encode(entries.tobytes()).decode()
+
+def _decode_entries(raw):
+    entries = array('q')
+    entries.frombytes(base64.b64decode(raw))
+    return entries
+
+class GiveawayManager:
+    """Giveaways ended by one shared DeadlineScheduler.
+
+    Entries are kept per giveaway as a sorted int64 array, so membership is a
+    binary search and a hundred thousand entrants cost ~800 KB rather than a
+    set of Python ints. They are persisted as (giveaway_id, chunk) rows of
+    up to GIVEAWAY_ENTRY_CHUNK ids in entry order, so a flush only
+    re-encodes the chunk still being filled. Embed edits showing the entry
+    count are debounced.
+    """
+
+    def __init__(self, bot, giveaways, entry_log):
+        self.bot = bot
+        self.giveaways = giveaways
+        self.entry_log = entry_log
+        self.entries = {}
+        self.open_chunks = {}
+        self.scheduler = DeadlineScheduler(self.end)
+        self.refresher = Debouncer(GIVEAWAY_EDIT_DELAY, self._refresh)
+
+    def load(self):
+        count = 0
+        for giveaway in self.giveaways.values():
+            if owns_guild(giveaway['guild_id']):
+                self.scheduler.schedule(giveaway['id'], giveaway['ends_at'])
+                count += 1
+        for (giveaway_id, chunk_id), chunk in sorted(self.entry_log.items()):
+            if giveaway_id in self.giveaways:
+                self.entries.setdefault(giveaway_id, array('q')).extend(chunk)
+                self.open_chunks[giveaway_id] = chunk_id
+        for giveaway_id in self.giveaways:
+            self.entries[giveaway_id] = array('q', sorted(self.entries.get(giveaway_id, ())))
+        print(f"Loaded {count} giveaway(s)")
+
+    def start(self):
+        self.scheduler.start()
+
+    def stop(self):
+        self.scheduler.stop()
+
+    def create(self, giveaway_id, guild_id, channel_id, message_id, prize, ends_at):
+        giveaway = {
+            'id': giveaway_id,
+            'guild_id': guild_id,
+            'channel_id': channel_id,
+            'message_id': message_id,
+            'prize': prize,
+            'ends_at': ends_at
+        }
+        self.giveaways[giveaway_id] = giveaway
+        self.entries[giveaway_id] = array('q')
+        self.open_chunks[giveaway_id] = 0
+        self.scheduler.schedule(giveaway_id, ends_at)
+        return giveaway
+
+    def attach(self, giveaway_id, message_id):
+        """Record the giveaway's message once it is posted; entries may already have come in."""
+        giveaway = self.giveaways.get(giveaway_id)
+        if giveaway is None:
+            return
+        giveaway['message_id'] = message_id
+        self.giveaways.save(giveaway_id)
+        if self.entries[giveaway_id]:
+            self.refresher.touch(giveaway_id)
+
+    def discard(self, giveaway_id):
+        """Forget a giveaway whose message could not be posted."""
+        self.giveaways.pop(giveaway_id, None)
+        self._drop_entries(giveaway_id)
+        self.scheduler.cancel(giveaway_id)
+
+    def _drop_entries(self, giveaway_id):
+        for chunk_id in range(self.open_chunks.pop(giveaway_id, -1) + 1):
+            self.entry_log.pop((giveaway_id, chunk_id), None)
+        return self.entries.pop(giveaway_id, None)
+
+    def _log_entry(self, giveaway_id, user_id):
+        chunk_id = self.open_chunks.get(giveaway_id, 0)
+        chunk = self.entry_log.get((giveaway_id, chunk_id))
+        if chunk is not None and len(chunk) >= GIVEAWAY_ENTRY_CHUNK:
+            chunk_id = self.open_chunks[giveaway_id] = chunk_id + 1
+            chunk = None
+        if chunk is None:
+            chunk = self.entry_log[(giveaway_id, chunk_id)] = array('q')
+        chunk.append(user_id)
+        self.entry_log.save((giveaway_id, chunk_id))
+
+    def enter(self, giveaway_id, user_id):
+        """Return None if the giveaway is not running, False if already entered, True otherwise."""
+        entries = self.entries.get(giveaway_id)
+        if entries is None:
+            return None
+        i = bisect.bisect_left(entries, user_id)
+        if i < len(entries) and entries[i] == user_id:
+            return False
+        entries.insert(i, user_id)
+        self._log_entry(giveaway_id, user_id)
+        self.refresher.touch(giveaway_id)
+        return True
+
+    @staticmethod
+    def embed(giveaway, entry_count, ended=False):
+        status = "Ended" if ended else f"Ends <t:{int(giveaway['ends_at'])}:R>"
+        return discord.Embed(
+            title="Giveaway Ended" if ended else "Giveaway!",
+            description=f"Prize: {giveaway['prize']}\n{status}\nEntries: {entry_count}",
+            color=discord.Color.dark_grey() if ended else discord.Color.gold()
+        )
+
+    def _message(self, giveaway):
+        channel = self.bot.get_partial_messageable(giveaway['channel_id'], guild_id=giveaway['guild_id'])
+        return channel.get_partial_message(giveaway['message_id'])
+
+    async def _refresh(self, giveaway_id):
+        giveaway = self.giveaways.get(giveaway_id)
+        if giveaway is not None and giveaway['message_id'] is not None:
+            await self._message(giveaway).edit(embed=self.embed(giveaway, len(self.entries[giveaway_id])))
+
+    async def end(self, giveaway_id):
+        giveaway = self.giveaways.pop(giveaway_id, None)
+        entries = self._drop_entries(giveaway_id)
+        if giveaway is None:
+            return
+        self.scheduler.cancel(giveaway_id)
+        message = self._message(giveaway)
+        entry_count = len(entries) if entries is not None else 0
+        try:
+            await message.edit(embed=self.embed(giveaway, entry_count, ended=True), view=None)
+        except discord.HTTPException as e:
+            print(f"Could not close giveaway {giveaway_id}: {e}")
+        if entry_count:
+            winner_id = random.choice(entries)
+            self.bot.outbound.send(message.channel, f"Congratulations <@{winner_id}>! You won the giveaway for {giveaway['prize']}!")
+        else:
+            self.bot.outbound.send(message.channel, "No one entered the giveaway.")
+
+class GiveawayEntryButton(discord.ui.DynamicItem[discord.ui.Button], template=r'giveaway:(?P<id>[0-9]+)'):
+    def __init__(self, giveaway_id: int):
+        super().__init__(discord.ui.Button(label="Enter Giveaway", style=discord.ButtonStyle.green, custom_id=f"giveaway:{giveaway_id}"))
+        self.giveaway_id = giveaway_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match['id']))
+
+    async def callback(self, interaction: discord.Interaction):
+        entered = interaction.client.get_cog('Giveaways').giveaways.enter(self.giveaway_id, interaction.user.id)
+        if entered is None:
+            await interaction.response.send_message("This giveaway has ended.", ephemeral=True)
+        elif entered:
+            await interaction.response.send_message("You've entered the giveaway!", ephemeral=True)
+        else:
+            await interaction.response.send_message("You've already entered this giveaway.", ephemeral=True)
+
+class Giveaways(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.giveaways = GiveawayManager(
+            bot,
+            bot.state.table('giveaways'),
+            bot.state.table('giveaway_entry_log', encode=_encode_entries, decode=_decode_entries)
+        )
+
+    async def cog_load(self):
+        self.giveaways.load()
+        self.giveaways.start()
+        self.bot.add_dynamic_items(GiveawayEntryButton)
+
+    async def cog_unload(self):
+        self.giveaways.stop()
+        self.bot.remove_dynamic_items(GiveawayEntryButton)
+
+    # 20. Giveaway System
+    @app_commands.command(name="start_giveaway", description="Start a giveaway")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    async def start_giveaway(self, interaction: discord.Interaction, duration: int, prize: str):
+        if duration < 1:
+            await interaction.response.send_message("Duration must be at least 1 minute.", ephemeral=True)
+            return
+        giveaway_id = interaction.id
+        ends_at = time.time() + duration * 60
+        giveaway = {'prize': prize, 'ends_at': ends_at}
+        view = discord.ui.View(timeout=None)
+        view.add_item(GiveawayEntryButton(giveaway_id))
+        # Registered before the send so entries made as soon as the button appears count
+        self.giveaways.create(giveaway_id, interaction.guild.id, interaction.channel_id, None, prize, ends_at)
+        await interaction.response.defer(ephemeral=True)
+        try:
+            message = await self.bot.outbound.send(interaction.channel, embed=GiveawayManager.embed(giveaway, 0), view=view)
+        except discord.HTTPException:
+            self.giveaways.discard(giveaway_id)
+            await interaction.followup.send("Couldn't post the giveaway in this channel. Please check my permissions.", ephemeral=True)
+            return
+        self.giveaways.attach(giveaway_id, message.id)
+        await interaction.followup.send("Giveaway started!", ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(Giveaways(bot))
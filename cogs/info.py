@@ -0,0 +1,189 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from core.cache import EMBED_TTL, FETCH_TTL
+
+class Info(commands.Cog):
+    """Server, user and object info commands, served from the response cache.
+
+    The listeners here only invalidate cache tags; gateway updates to a
+    guild, member, role, channel or emoji drop the embeds built from it.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    # 2. Server Info Command
+    @app_commands.command(name="serverinfo", description="Get information about the server")
+    async def serverinfo(self, interaction: discord.Interaction):
+        guild = interaction.guild
+
+        def build():
+            embed = discord.Embed(title=f"{guild.name} Server Information", color=discord.Color.blue())
+            embed.add_field(name="Owner", value=f"<@{guild.owner_id}>", inline=True)
+            embed.add_field(name="Members", value=guild.member_count, inline=True)
+            embed.add_field(name="Channels", value=len(guild.channels), inline=True)
+            embed.add_field(name="Roles", value=len(guild.roles), inline=True)
+            embed.add_field(name="Created At", value=guild.created_at.strftime("%Y-%m-%d"), inline=True)
+            embed.set_thumbnail(url=guild.icon.url if guild.icon else None)
+            return embed
+
+        embed = self.bot.cache.cached(('serverinfo', guild.id), EMBED_TTL, [('guild', guild.id)], build)
+        await interaction.response.send_message(embed=embed)
+
+    # 3. User Info Command
+    @app_commands.command(name="userinfo", description="Get information about a user")
+    async def userinfo(self, interaction: discord.Interaction, member: discord.Member = None):
+        member = member or interaction.user
+
+        def build():
+            embed = discord.Embed(title=f"User Information - {member.name}", color=member.color)
+            embed.add_field(name="ID", value=member.id, inline=True)
+            embed.add_field(name="Joined At", value=member.joined_at.strftime("%Y-%m-%d"), inline=True)
+            embed.add_field(name="Created At", value=member.created_at.strftime("%Y-%m-%d"), inline=True)
+            embed.add_field(name="Top Role", value=member.top_role.mention, inline=True)
+            embed.set_thumbnail(url=member.avatar.url if member.avatar else member.default_avatar.url)
+            return embed
+
+        tags = [('member', member.guild.id, member.id), ('user', member.id), ('guild', member.guild.id)]
+        embed = self.bot.cache.cached(('userinfo', member.guild.id, member.id), EMBED_TTL, tags, build)
+        await interaction.response.send_message(embed=embed)
+
+    # 26. Emoji Info
+    @app_commands.command(name="emojiinfo", description="Get information about an emoji")
+    async def emojiinfo(self, interaction: discord.Interaction, emoji: str):
+        # discord.Emoji has no app command transformer; take the emoji text and resolve it here
+        partial = discord.PartialEmoji.from_str(emoji.strip())
+        emoji = interaction.guild.get_emoji(partial.id) if partial.id and interaction.guild else None
+        if emoji is None:
+            await interaction.response.send_message("Emoji not found. Use a custom emoji from this server.", ephemeral=True)
+            return
+
+        def build():
+            embed = discord.Embed(title=f"Emoji Information: {emoji.name}", color=discord.Color.blue())
+            embed.add_field(name="ID", value=emoji.id, inline=True)
+            embed.add_field(name="Created At", value=emoji.created_at.strftime("%Y-%m-%d"), inline=True)
+            embed.add_field(name="Animated", value=emoji.animated, inline=True)
+            embed.add_field(name="Available", value=emoji.available, inline=True)
+            embed.set_thumbnail(url=emoji.url)
+            return embed
+
+        embed = self.bot.cache.cached(('emojiinfo', emoji.id), EMBED_TTL, [('emojis', emoji.guild_id)], build)
+        await interaction.response.send_message(embed=embed)
+
+    # 27. Channel Info
+    @app_commands.command(name="channelinfo", description="Get information about a channel")
+    async def channelinfo(self, interaction: discord.Interaction, channel: discord.TextChannel = None):
+        channel = channel or interaction.channel
+
+        def build():
+            embed = discord.Embed(title=f"Channel Information: {channel.name}", color=discord.Color.blue())
+            embed.add_field(name="ID", value=channel.id, inline=True)
+            embed.add_field(name="Created At", value=channel.created_at.strftime("%Y-%m-%d"), inline=True)
+            embed.add_field(name="Category", value=channel.category.name if channel.category else "None", inline=True)
+            embed.add_field(name="Topic", value=channel.topic or "No topic set", inline=False)
+            return embed
+
+        embed = self.bot.cache.cached(('channelinfo', channel.id), EMBED_TTL, [('channel', channel.guild.id, channel.id)], build)
+        await interaction.response.send_message(embed=embed)
+
+    # 28. Server Icon
+    @app_commands.command(name="servericon", description="Get the server's icon")
+    async def servericon(self, interaction: discord.Interaction):
+        if interaction.guild.icon:
+            embed = discord.Embed(title=f"{interaction.guild.name}'s Icon")
+            embed.set_image(url=interaction.guild.icon.url)
+            await interaction.response.send_message(embed=embed)
+        else:
+            await interaction.response.send_message("This server doesn't have an icon.")
+
+    # 29. User Banner
+    @app_commands.command(name="banner", description="Get a user's banner")
+    async def banner(self, interaction: discord.Interaction, member: discord.Member = None):
+        member = member or interaction.user
+        user = await self.bot.cache.fetch(('user', member.id), FETCH_TTL, [('user', member.id)], lambda: self.bot.fetch_user(member.id))
+        if user.banner:
+            embed = discord.Embed(title=f"{user.name}'s Banner")
+            embed.set_image(url=user.banner.url)
+            await interaction.response.send_message(embed=embed)
+        else:
+            await interaction.response.send_message("This user doesn't have a banner.")
+
+    # 30. Invite Info
+    @app_commands.command(name="inviteinfo", description="Get information about an invite")
+    async def inviteinfo(self, interaction: discord.Interaction, invite_code: str):
+        try:
+            invite = await self.bot.cache.fetch(('invite', invite_code), FETCH_TTL, [], lambda: self.bot.fetch_invite(invite_code))
+            embed = discord.Embed(title="Invite Information", color=discord.Color.blue())
+            embed.add_field(name="Server", value=invite.guild.name, inline=True)
+            embed.add_field(name="Channel", value=invite.channel.name, inline=True)
+            embed.add_field(name="Inviter", value=invite.inviter.name if invite.inviter else "Unknown", inline=True)
+            embed.add_field(name="Max Uses", value=invite.max_uses if invite.max_uses else "Unlimited", inline=True)
+            embed.add_field(name="Expires At", value=invite.expires_at.strftime("%Y-%m-%d %H:%M:%S") if invite.expires_at else "Never", inline=True)
+            await interaction.response.send_message(embed=embed)
+        except discord.NotFound:
+            await interaction.response.send_message("Invalid invite code.")
+
+    # 31. Message Info
+    @app_commands.command(name="messageinfo", description="Get information about a message")
+    async def messageinfo(self, interaction: discord.Interaction, message_id: str):
+        try:
+            message = await interaction.channel.fetch_message(int(message_id))
+            embed = discord.Embed(title="Message Information", color=discord.Color.blue())
+            embed.add_field(name="Author", value=message.author.name, inline=True)
+            embed.add_field(name="Created At", value=message.created_at.strftime("%Y-%m-%d %H:%M:%S"), inline=True)
+            embed.add_field(name="Edited At", value=message.edited_at.strftime("%Y-%m-%d %H:%M:%S") if message.edited_at else "Not edited", inline=True)
+            embed.add_field(name="Content", value=message.content[:1024] if message.content else "No content", inline=False)
+            embed.add_field(name="Attachments", value=len(message.attachments), inline=True)
+            embed.add_field(name="Embeds", value=len(message.embeds), inline=True)
+            await interaction.response.send_message(embed=embed)
+        except discord.NotFound:
+            await interaction.response.send_message("Message not found.")
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        self.bot.cache.invalidate(('member', after.guild.id, after.id))
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before, after):
+        self.bot.cache.invalidate(('user', after.id))
+
+    @commands.Cog.listener()
+    async def on_guild_update(self, before, after):
+        self.bot.cache.invalidate(('guild', after.id))
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role):
+        self.bot.cache.invalidate(('guild', role.guild.id))
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        self.bot.cache.invalidate(('role', after.guild.id, after.id), ('guild', after.guild.id))
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        self.bot.cache.invalidate(('role', role.guild.id, role.id), ('guild', role.guild.id))
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        self.bot.cache.invalidate(('guild', channel.guild.id))
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        self.bot.cache.invalidate(('channel', after.guild.id, after.id))
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self.bot.cache.invalidate(('channel', channel.guild.id, channel.id), ('guild', channel.guild.id))
+
+    @commands.Cog.listener()
+    async def on_guild_emojis_update(self, guild, before, after):
+        self.bot.cache.invalidate(('emojis', guild.id))
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.bot.cache.invalidate(('guild', guild.id))
+
+async def setup(bot):
+    await bot.add_cog(Info(bot))
@@ -0,0 +1,231 @@
+import asyncio
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from core.dispatch import MESSAGE_LIMIT
+from core.utils import compile_template
+
+MEMBER_TEMPLATE_FIELDS = {'member', 'member.mention', 'member.name', 'member.display_name', 'member.id', 'server', 'count'}
+JOIN_BURST_WINDOW = 5
+JOIN_BURST_THRESHOLD = 5
+JOIN_SUMMARY_NAMES = 30
+AUTO_ROLE_WORKERS = 4
+AUTO_ROLE_QUEUE_SIZE = 10000
+AUTO_ROLE_RETRIES = 3
+
+def render_member_template(parts, member):
+    out = []
+    for is_field, value in parts:
+        if not is_field:
+            out.append(value)
+        elif value == 'member':
+            out.append(str(member))
+        elif value == 'member.mention':
+            out.append(member.mention)
+        elif value == 'member.name':
+            out.append(member.name)
+        elif value == 'member.display_name':
+            out.append(member.display_name)
+        elif value == 'member.id':
+            out.append(str(member.id))
+        elif value == 'server':
+            out.append(member.guild.name)
+        elif value == 'count':
+            out.append(str(member.guild.member_count))
+    return ''.join(out)
+
+class MemberAnnouncer:
+    """Welcome/farewell messages with burst coalescing.
+
+    The first join (or leave) in a quiet guild is announced immediately and
+    opens a JOIN_BURST_WINDOW. Members arriving inside the window are
+    buffered; at the end of the window a handful are announced one by one,
+    while a larger burst becomes a single summary message and opens another
+    window, so a raid costs one message per window.
+    """
+
+    def __init__(self, bot, kind, table, pending=None):
+        self.bot = bot
+        self.kind = kind
+        self.table = table
+        self.compiled = {}
+        self.pending = {} if pending is None else pending
+
+    def set(self, guild_id, channel_id, template):
+        parts = compile_template(template, MEMBER_TEMPLATE_FIELDS)
+        self.table[guild_id] = {"channel": channel_id, "message": template}
+        self.compiled[guild_id] = parts
+
+    def _template(self, guild_id):
+        parts = self.compiled.get(guild_id)
+        if parts is None:
+            parts = self.compiled[guild_id] = compile_template(self.table[guild_id]["message"], MEMBER_TEMPLATE_FIELDS)
+        return parts
+
+    def announce(self, member):
+        guild_id = member.guild.id
+        if guild_id not in self.table:
+            return
+        pending = self.pending.get(guild_id)
+        if pending is not None:
+            pending.append(member)
+            return
+        self.pending[guild_id] = []
+        asyncio.get_running_loop().call_later(JOIN_BURST_WINDOW, self._flush, guild_id)
+        self._send(member.guild, [member])
+
+    def _flush(self, guild_id):
+        members = self.pending.pop(guild_id, [])
+        if not members:
+            return
+        # Keep coalescing while the burst continues
+        self.pending[guild_id] = []
+        asyncio.get_running_loop().call_later(JOIN_BURST_WINDOW, self._flush, guild_id)
+        self._send(members[0].guild, members)
+
+    def _send(self, guild, members):
+        info = self.table.get(guild.id)
+        channel = guild.get_channel(info["channel"]) if info else None
+        if channel is None:
+            return
+        try:
+            parts = self._template(guild.id)
+        except ValueError as e:
+            print(f"Invalid {self.kind} template in guild {guild.id}: {e}")
+            return
+        mentions = discord.AllowedMentions(users=True, everyone=False, roles=False)
+        if len(members) <= JOIN_BURST_THRESHOLD:
+            for member in members:
+                self.bot.outbound.send(channel, render_member_template(parts, member), allowed_mentions=mentions)
+            return
+        names = ", ".join(member.mention if self.kind == 'welcome' else member.name for member in members[:JOIN_SUMMARY_NAMES])
+        extra = len(members) - JOIN_SUMMARY_NAMES
+        if extra > 0:
+            names += f" and {extra} more"
+        verb = "Welcome to" if self.kind == 'welcome' else "Goodbye from"
+        self.bot.outbound.send(channel, f"{verb} {len(members)} members who just {'joined' if self.kind == 'welcome' else 'left'}: {names}"[:MESSAGE_LIMIT], allowed_mentions=mentions)
+
+class RoleAssigner:
+    """Bounded queue of auto-role grants drained by a few workers with retry backoff."""
+
+    def __init__(self, queue=None):
+        self.queue = queue or asyncio.Queue(maxsize=AUTO_ROLE_QUEUE_SIZE)
+        self.workers = []
+        self.dropped = 0
+
+    def start(self):
+        if not self.workers:
+            self.workers = [asyncio.create_task(self._work()) for _ in range(AUTO_ROLE_WORKERS)]
+
+    def stop(self):
+        for worker in self.workers:
+            worker.cancel()
+        self.workers = []
+
+    def assign(self, member, role):
+        try:
+            self.queue.put_nowait((member, role))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            print(f"Auto-role queue full, skipped {member.id} in guild {member.guild.id}")
+
+    async def _work(self):
+        while True:
+            member, role = await self.queue.get()
+            try:
+                await self._assign(member, role)
+            finally:
+                self.queue.task_done()
+
+    async def _assign(self, member, role):
+        for attempt in range(AUTO_ROLE_RETRIES):
+            try:
+                await member.add_roles(role, reason="Auto role")
+                return
+            except discord.Forbidden as e:
+                print(f"Cannot assign auto role in guild {member.guild.id}: {e}")
+                return
+            except discord.NotFound:
+                return
+            except discord.HTTPException as e:
+                if attempt == AUTO_ROLE_RETRIES - 1:
+                    print(f"Giving up on auto role for {member.id}: {e}")
+                    return
+                await asyncio.sleep(2 ** attempt)
+
+class Members(commands.Cog):
+    """Welcome and farewell announcements plus the auto role for new members."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        # Open burst windows and queued role grants outlive a reload
+        carried = bot.carryover.pop(self.qualified_name, {})
+        self.welcome_messages = MemberAnnouncer(bot, 'welcome', bot.state.table('welcome_messages', per_guild=True), carried.get('welcome'))
+        self.farewell_messages = MemberAnnouncer(bot, 'farewell', bot.state.table('farewell_messages', per_guild=True), carried.get('farewell'))
+        self.auto_roles = bot.state.table('auto_roles', per_guild=True)
+        self.role_assigner = RoleAssigner(carried.get('role_queue'))
+
+    async def cog_load(self):
+        self.role_assigner.start()
+
+    async def cog_unload(self):
+        self.role_assigner.stop()
+        self.bot.carryover[self.qualified_name] = {
+            'welcome': self.welcome_messages.pending,
+            'farewell': self.farewell_messages.pending,
+            'role_queue': self.role_assigner.queue,
+        }
+
+    # 12. Welcome Message Setup
+    @app_commands.command(name="set_welcome", description="Set up a welcome message")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    @app_commands.describe(message="Placeholders: {member}, {member.mention}, {member.name}, {member.display_name}, {member.id}, {server}, {count}")
+    async def set_welcome(self, interaction: discord.Interaction, channel: discord.TextChannel, message: str):
+        try:
+            self.welcome_messages.set(interaction.guild.id, channel.id, message)
+        except ValueError as e:
+            await interaction.response.send_message(str(e), ephemeral=True)
+            return
+        await interaction.response.send_message(f"Welcome message set in {channel.mention}")
+
+    # 13. Farewell Message Setup
+    @app_commands.command(name="set_farewell", description="Set up a farewell message")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    @app_commands.describe(message="Placeholders: {member}, {member.mention}, {member.name}, {member.display_name}, {member.id}, {server}, {count}")
+    async def set_farewell(self, interaction: discord.Interaction, channel: discord.TextChannel, message: str):
+        try:
+            self.farewell_messages.set(interaction.guild.id, channel.id, message)
+        except ValueError as e:
+            await interaction.response.send_message(str(e), ephemeral=True)
+            return
+        await interaction.response.send_message(f"Farewell message set in {channel.mention}")
+
+    # 23. Auto Role
+    @app_commands.command(name="set_auto_role", description="Set a role to be automatically assigned to new members")
+    @app_commands.checks.has_permissions(manage_roles=True)
+    async def set_auto_role(self, interaction: discord.Interaction, role: discord.Role):
+        self.auto_roles[interaction.guild.id] = role.id
+        await interaction.response.send_message(f"Auto role set to {role.name}")
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        await self.bot.state.load_scope(member.guild.id)
+        # Auto role
+        if member.guild.id in self.auto_roles:
+            role = member.guild.get_role(self.auto_roles[member.guild.id])
+            if role:
+                self.role_assigner.assign(member, role)
+
+        # Welcome message
+        self.welcome_messages.announce(member)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        await self.bot.state.load_scope(member.guild.id)
+        # Farewell message
+        self.farewell_messages.announce(member)
+
+async def setup(bot):
+    await bot.add_cog(Members(bot))
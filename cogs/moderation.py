@@ -0,0 +1,180 @@
+import asyncio
+import re
+import time
+from datetime import timedelta
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+PURGE_MAX_SCAN = 50000
+BULK_DELETE_SIZE = 100
+# Bulk delete rejects messages older than 14 days; keep a margin for clock skew
+BULK_DELETE_MAX_AGE = timedelta(days=14, minutes=-5)
+PURGE_SINGLE_DELETE_DELAY = 1.0
+PURGE_PROGRESS_INTERVAL = 3
+
+class PurgeJob:
+    """Streams channel history and deletes matching messages.
+
+    History is read page by page and matches are held in a single batch of
+    at most BULK_DELETE_SIZE, so memory stays flat however far back the
+    scan goes. Messages too old for bulk delete are removed one at a time.
+    """
+
+    def __init__(self, channel, limit, check, before=None, after=None):
+        self.channel = channel
+        self.limit = limit
+        self.check = check
+        self.before = before
+        self.after = after
+        self.scanned = 0
+        self.matched = 0
+        self.deleted = 0
+        self.cancelled = False
+        self.finished = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    async def run(self, progress=None):
+        cutoff = discord.utils.time_snowflake(discord.utils.utcnow() - BULK_DELETE_MAX_AGE)
+        batch = []
+        last_progress = time.monotonic()
+        try:
+            async for message in self.channel.history(limit=self.limit, before=self.before, after=self.after, oldest_first=False):
+                if self.cancelled:
+                    break
+                self.scanned += 1
+                if self.check(message):
+                    self.matched += 1
+                    if message.id >= cutoff:
+                        batch.append(message)
+                        if len(batch) == BULK_DELETE_SIZE:
+                            await self._bulk_delete(batch)
+                            batch = []
+                    else:
+                        # History is newest first, so anything left in the batch is
+                        # already as old as it will get; flush before going slow.
+                        if batch:
+                            await self._bulk_delete(batch)
+                            batch = []
+                        await self._delete_one(message)
+                if progress is not None and time.monotonic() - last_progress >= PURGE_PROGRESS_INTERVAL:
+                    last_progress = time.monotonic()
+                    await progress(self)
+            if batch and not self.cancelled:
+                await self._bulk_delete(batch)
+        finally:
+            self.finished = True
+
+    async def _bulk_delete(self, batch):
+        if len(batch) == 1:
+            await self._delete_one(batch[0])
+            return
+        await self.channel.delete_messages(batch)
+        self.deleted += len(batch)
+
+    async def _delete_one(self, message):
+        try:
+            await message.delete()
+            self.deleted += 1
+        except discord.NotFound:
+            pass
+        await asyncio.sleep(PURGE_SINGLE_DELETE_DELAY)
+
+    def summary(self):
+        state = "Cancelled" if self.cancelled else "Done" if self.finished else "Purging"
+        return f"{state}: scanned {self.scanned:,}/{self.limit:,}, matched {self.matched:,}, deleted {self.deleted:,}."
+
+class PurgeControlView(discord.ui.View):
+    def __init__(self, job, user_id):
+        super().__init__(timeout=None)
+        self.job = job
+        self.user_id = user_id
+
+    @discord.ui.button(label="Cancel", style=discord.ButtonStyle.danger)
+    async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.user.id != self.user_id:
+            await interaction.response.send_message("Only the moderator who started this purge can cancel it.", ephemeral=True)
+            return
+        self.job.cancel()
+        button.disabled = True
+        await interaction.response.edit_message(content="Cancelling...", view=self)
+
+class Moderation(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        # Running purges keep going through a reload; keep guarding their channels
+        self.purges = bot.carryover.pop(self.qualified_name, {})
+
+    async def cog_unload(self):
+        self.bot.carryover[self.qualified_name] = self.purges
+
+    # 15. Purge Messages
+    @app_commands.command(name="purge", description="Delete recent messages, optionally filtered")
+    @app_commands.checks.has_permissions(manage_messages=True)
+    @app_commands.guild_only()
+    @app_commands.describe(
+        amount=f"Number of recent messages to scan (max {PURGE_MAX_SCAN:,})",
+        author="Only delete messages from this user",
+        pattern="Only delete messages whose content matches this regex",
+        attachments="Only delete messages with attachments",
+        bots="Only delete messages sent by bots",
+        newer_than="Only delete messages from the last N minutes",
+        older_than="Only delete messages older than N minutes"
+    )
+    async def purge(self, interaction: discord.Interaction, amount: int, author: discord.User = None, pattern: str = None,
+                    attachments: bool = False, bots: bool = False, newer_than: int = None, older_than: int = None):
+        if amount < 1 or amount > PURGE_MAX_SCAN:
+            await interaction.response.send_message(f"Please specify a number between 1 and {PURGE_MAX_SCAN:,}.", ephemeral=True)
+            return
+        if interaction.channel_id in self.purges:
+            await interaction.response.send_message("A purge is already running in this channel.", ephemeral=True)
+            return
+        try:
+            regex = re.compile(pattern, re.IGNORECASE) if pattern else None
+        except re.error as e:
+            await interaction.response.send_message(f"Invalid pattern: {e}", ephemeral=True)
+            return
+
+        def check(message):
+            if author is not None and message.author.id != author.id:
+                return False
+            if bots and not message.author.bot:
+                return False
+            if attachments and not message.attachments:
+                return False
+            if regex is not None and not regex.search(message.content):
+                return False
+            return True
+
+        now = discord.utils.utcnow()
+        after = now - timedelta(minutes=newer_than) if newer_than else None
+        before = now - timedelta(minutes=older_than) if older_than else interaction.created_at
+        job = PurgeJob(interaction.channel, amount, check, before=before, after=after)
+        view = PurgeControlView(job, interaction.user.id)
+        self.purges[interaction.channel_id] = job
+        await interaction.response.send_message(job.summary(), view=view, ephemeral=True)
+
+        async def progress(job):
+            try:
+                await interaction.edit_original_response(content=job.summary())
+            except discord.HTTPException:
+                # Interaction tokens expire after 15 minutes; keep purging regardless
+                pass
+
+        try:
+            await job.run(progress)
+        except discord.Forbidden:
+            await interaction.followup.send("I don't have permission to delete messages here.", ephemeral=True)
+        finally:
+            del self.purges[interaction.channel_id]
+            view.stop()
+            try:
+                await interaction.edit_original_response(content=job.summary(), view=None)
+            except discord.HTTPException:
+                pass
+
+async def setup(bot):
+    await bot.add_cog(Moderation(bot))
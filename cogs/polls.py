@@ -0,0 +1,248 @@
+import time
+from array import array
+from datetime import datetime, timezone
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from core.config import owns_guild
+from core.scheduling import DeadlineScheduler, Debouncer
+
+POLL_EDIT_DELAY = 3
+POLL_BAR_WIDTH = 10
+
+class PollManager:
+    """Button polls with in-memory tallies and debounced result embeds.
+
+    Each poll keeps a counter array with one slot per option, and every
+    ballot is its own (poll_id, user_id) -> option row, so a vote or a
+    changed vote is O(1) to apply and to persist. The results
+    embed is re-rendered at most once per POLL_EDIT_DELAY seconds. Polls
+    with a deadline are closed by a shared DeadlineScheduler.
+    """
+
+    def __init__(self, bot, polls, ballots):
+        self.bot = bot
+        self.polls = polls
+        self.ballots = ballots
+        self.counts = {}
+        self.scheduler = DeadlineScheduler(self.close)
+        self.refresher = Debouncer(POLL_EDIT_DELAY, self._refresh)
+
+    def load(self):
+        for poll in self.polls.values():
+            if not owns_guild(poll['guild_id']):
+                continue
+            self.counts[poll['id']] = array('I', bytes(4 * len(poll['options'])))
+            if poll['ends_at'] is not None:
+                self.scheduler.schedule(poll['id'], poll['ends_at'])
+        for (poll_id, _), choice in self.ballots.items():
+            counts = self.counts.get(poll_id)
+            if counts is not None:
+                counts[choice] += 1
+        print(f"Loaded {len(self.counts)} poll(s)")
+
+    def start(self):
+        self.scheduler.start()
+
+    def stop(self):
+        self.scheduler.stop()
+
+    def create(self, poll_id, guild_id, channel_id, message_id, author_id, question, options, ends_at=None):
+        poll = {
+            'id': poll_id,
+            'guild_id': guild_id,
+            'channel_id': channel_id,
+            'message_id': message_id,
+            'author_id': author_id,
+            'question': question,
+            'options': options,
+            'ends_at': ends_at
+        }
+        self.polls[poll_id] = poll
+        self.counts[poll_id] = array('I', bytes(4 * len(options)))
+        if ends_at is not None:
+            self.scheduler.schedule(poll_id, ends_at)
+        return poll
+
+    def attach(self, poll_id, message_id):
+        """Record the poll's message once it is posted; votes may already have come in."""
+        poll = self.polls.get(poll_id)
+        if poll is None:
+            return
+        poll['message_id'] = message_id
+        self.polls.save(poll_id)
+        if sum(self.counts[poll_id]):
+            self.refresher.touch(poll_id)
+
+    def discard(self, poll_id):
+        """Forget a poll whose message could not be posted."""
+        self.polls.pop(poll_id, None)
+        self.counts.pop(poll_id, None)
+        self._drop_ballots(poll_id)
+        self.scheduler.cancel(poll_id)
+
+    def _drop_ballots(self, poll_id):
+        # Only runs when a poll ends, so a scan over all ballots is acceptable
+        for key in [key for key in self.ballots if key[0] == poll_id]:
+            del self.ballots[key]
+
+    def vote(self, poll_id, user_id, choice):
+        """Record a vote; return None if the poll is closed, else the user's previous choice (-1 if none)."""
+        counts = self.counts.get(poll_id)
+        if counts is None:
+            return None
+        previous = self.ballots.get((poll_id, user_id), -1)
+        if previous == choice:
+            return previous
+        if previous >= 0:
+            counts[previous] -= 1
+        counts[choice] += 1
+        self.ballots[(poll_id, user_id)] = choice
+        self.refresher.touch(poll_id)
+        return previous
+
+    @staticmethod
+    def embed(poll, counts, closed=False):
+        total = sum(counts)
+        embed = discord.Embed(
+            title="Poll Closed" if closed else "Poll",
+            description=poll['question'],
+            color=discord.Color.dark_grey() if closed else discord.Color.blue()
+        )
+        for i, option in enumerate(poll['options']):
+            share = counts[i] / total if total else 0
+            filled = round(share * POLL_BAR_WIDTH)
+            bar = "█" * filled + "░" * (POLL_BAR_WIDTH - filled)
+            embed.add_field(name=f"{i + 1}. {option}", value=f"{bar} {counts[i]} ({share:.0%})", inline=False)
+        if closed:
+            footer = f"{total} vote(s)"
+        elif poll['ends_at'] is not None:
+            footer = f"{total} vote(s) | Closes at"
+            embed.timestamp = datetime.fromtimestamp(poll['ends_at'], tz=timezone.utc)
+        else:
+            footer = f"{total} vote(s)"
+        embed.set_footer(text=footer)
+        return embed
+
+    def _message(self, poll):
+        channel = self.bot.get_partial_messageable(poll['channel_id'], guild_id=poll['guild_id'])
+        return channel.get_partial_message(poll['message_id'])
+
+    async def _refresh(self, poll_id):
+        poll = self.polls.get(poll_id)
+        if poll is not None and poll['message_id'] is not None:
+            await self._message(poll).edit(embed=self.embed(poll, self.counts[poll_id]))
+
+    async def close(self, poll_id):
+        poll = self.polls.pop(poll_id, None)
+        counts = self.counts.pop(poll_id, None)
+        if poll is None:
+            return False
+        self._drop_ballots(poll_id)
+        self.scheduler.cancel(poll_id)
+        message = self._message(poll)
+        try:
+            await message.edit(embed=self.embed(poll, counts, closed=True), view=None)
+        except discord.HTTPException as e:
+            print(f"Could not close poll {poll_id}: {e}")
+        top = max(counts)
+        if top:
+            winners = ", ".join(option for i, option in enumerate(poll['options']) if counts[i] == top)
+            summary = f"Poll closed: **{poll['question']}**. Winner: {winners} with {top} vote(s)."
+        else:
+            summary = f"Poll closed: **{poll['question']}**. No votes were cast."
+        self.bot.outbound.send(message.channel, summary, reference=message)
+        return True
+
+class PollButton(discord.ui.DynamicItem[discord.ui.Button], template=r'poll:(?P<id>[0-9]+):(?P<choice>[0-9]+|close)'):
+    def __init__(self, poll_id: int, choice, label: str = None):
+        if choice == 'close':
+            button = discord.ui.Button(label="Close Poll", style=discord.ButtonStyle.danger, custom_id=f"poll:{poll_id}:close")
+        else:
+            button = discord.ui.Button(label=label or str(choice + 1), style=discord.ButtonStyle.primary, custom_id=f"poll:{poll_id}:{choice}")
+        super().__init__(button)
+        self.poll_id = poll_id
+        self.choice = choice
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        choice = match['choice']
+        return cls(int(match['id']), choice if choice == 'close' else int(choice), item.label)
+
+    async def callback(self, interaction: discord.Interaction):
+        polls = interaction.client.get_cog('Polls').polls
+        poll = polls.polls.get(self.poll_id)
+        if poll is None:
+            await interaction.response.send_message("This poll is closed.", ephemeral=True)
+            return
+        if self.choice == 'close':
+            if interaction.user.id != poll['author_id'] and not interaction.permissions.manage_messages:
+                await interaction.response.send_message("Only the poll creator or a moderator can close this poll.", ephemeral=True)
+                return
+            await interaction.response.send_message("Poll closed.", ephemeral=True)
+            await polls.close(self.poll_id)
+            return
+        previous = polls.vote(self.poll_id, interaction.user.id, self.choice)
+        option = poll['options'][self.choice]
+        if previous == self.choice:
+            await interaction.response.send_message(f"You already voted for {option}.", ephemeral=True)
+        elif previous >= 0:
+            await interaction.response.send_message(f"Changed your vote to {option}.", ephemeral=True)
+        else:
+            await interaction.response.send_message(f"Voted for {option}.", ephemeral=True)
+
+class Polls(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.polls = PollManager(
+            bot,
+            bot.state.table('poll_info'),
+            bot.state.table('poll_ballots')
+        )
+
+    async def cog_load(self):
+        self.polls.load()
+        self.polls.start()
+        self.bot.add_dynamic_items(PollButton)
+
+    async def cog_unload(self):
+        self.polls.stop()
+        self.bot.remove_dynamic_items(PollButton)
+
+    # 6. Poll Command
+    @app_commands.command(name="poll", description="Create a poll")
+    @app_commands.guild_only()
+    @app_commands.describe(options="2-10 options separated by commas", duration="Minutes until the poll closes automatically")
+    async def poll(self, interaction: discord.Interaction, question: str, options: str, duration: int = None):
+        options_list = [option.strip() for option in options.split(',') if option.strip()]
+        if len(options_list) < 2 or len(options_list) > 10:
+            await interaction.response.send_message("Please provide 2-10 options separated by commas.", ephemeral=True)
+            return
+        if duration is not None and duration < 1:
+            await interaction.response.send_message("Duration must be at least 1 minute.", ephemeral=True)
+            return
+
+        poll_id = interaction.id
+        ends_at = time.time() + duration * 60 if duration else None
+        preview = {'question': question, 'options': options_list, 'ends_at': ends_at}
+        view = discord.ui.View(timeout=None)
+        for i, option in enumerate(options_list):
+            view.add_item(PollButton(poll_id, i, option[:80]))
+        view.add_item(PollButton(poll_id, 'close'))
+
+        # Registered before the send so votes cast as soon as the buttons appear count
+        self.polls.create(poll_id, interaction.guild.id, interaction.channel_id, None, interaction.user.id, question, options_list, ends_at)
+        await interaction.response.defer(ephemeral=True)
+        try:
+            poll_msg = await self.bot.outbound.send(interaction.channel, embed=PollManager.embed(preview, [0] * len(options_list)), view=view)
+        except discord.HTTPException:
+            self.polls.discard(poll_id)
+            await interaction.followup.send("Couldn't post the poll in this channel. Please check my permissions.", ephemeral=True)
+            return
+        self.polls.attach(poll_id, poll_msg.id)
+        await interaction.followup.send("Poll created!", ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(Polls(bot))
@@ -0,0 +1,157 @@
+import re
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from core.dispatch import MESSAGE_LIMIT
+from core.scheduling import Debouncer
+from core.utils import role_ids
+
+REACTION_ROLE_DELAY = 1.5
+
+class ReactionRoleBatcher:
+    """Per-member role toggles applied with one request per debounce window.
+
+    Clicks only record the desired state of each role; rapid toggles on the
+    same member collapse into one request. A single net change uses the
+    per-role endpoint; several are applied as one full role list built from
+    the cached member, or from a fresh fetch when the member is not cached,
+    so roles changed by others since the click are not reverted.
+    """
+
+    def __init__(self, delay=REACTION_ROLE_DELAY, pending=None, members=None):
+        self.pending = {} if pending is None else pending
+        self.members = {} if members is None else members
+        self.flusher = Debouncer(delay, self._flush)
+
+    def has_role(self, member, role_id):
+        changes = self.pending.get((member.guild.id, member.id), {})
+        if role_id in changes:
+            return changes[role_id]
+        return member.get_role(role_id) is not None
+
+    def request(self, member, changes):
+        key = (member.guild.id, member.id)
+        self.pending.setdefault(key, {}).update(changes)
+        self.members[key] = member
+        self.flusher.touch(key)
+
+    async def _flush(self, key):
+        changes = self.pending.pop(key, None)
+        member = self.members.pop(key, None)
+        if not changes:
+            return
+        cached = member.guild.get_member(member.id)
+        member = cached or member
+        current = role_ids(member)
+        added = {r for r, on in changes.items() if on} - current
+        removed = {r for r, on in changes.items() if not on} & current
+        if len(added) + len(removed) == 1:
+            if added:
+                await member.add_roles(discord.Object(added.pop()), reason="Reaction roles")
+            else:
+                await member.remove_roles(discord.Object(removed.pop()), reason="Reaction roles")
+            return
+        if not added and not removed:
+            return
+        if cached is None:
+            # The interaction's member snapshot may predate role changes made by others
+            try:
+                member = await member.guild.fetch_member(member.id)
+            except discord.NotFound:
+                return
+            current = role_ids(member)
+        roles = (current | {r for r, on in changes.items() if on}) - {r for r, on in changes.items() if not on}
+        if roles != current:
+            await member.edit(roles=[discord.Object(r) for r in roles], reason="Reaction roles")
+
+REACTION_ROLE_MAX = 25
+
+class ReactionRoleButton(discord.ui.DynamicItem[discord.ui.Button], template=r'rr:(?P<role>[0-9]+)'):
+    def __init__(self, role_id: int, label: str = None):
+        super().__init__(discord.ui.Button(label=label, style=discord.ButtonStyle.primary, custom_id=f"rr:{role_id}"))
+        self.role_id = role_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match['role']), item.label)
+
+    async def callback(self, interaction: discord.Interaction):
+        role = interaction.guild.get_role(self.role_id)
+        if role is None:
+            await interaction.response.send_message("This role no longer exists.", ephemeral=True)
+            return
+        reaction_roles = interaction.client.get_cog('ReactionRoles').reaction_roles
+        add = not reaction_roles.has_role(interaction.user, role.id)
+        reaction_roles.request(interaction.user, {role.id: add})
+        await interaction.response.send_message(f"{'Added' if add else 'Removed'} {role.name} role.", ephemeral=True)
+
+class ReactionRoleSelect(discord.ui.DynamicItem[discord.ui.Select], template=r'rr:menu'):
+    def __init__(self, options):
+        super().__init__(discord.ui.Select(
+            custom_id="rr:menu",
+            placeholder="Choose your roles",
+            min_values=0,
+            max_values=len(options),
+            options=options
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Select, match):
+        return cls(item.options)
+
+    async def callback(self, interaction: discord.Interaction):
+        # The menu's own options define the panel, so no per-message state is needed
+        selected = {int(value) for value in self.item.values}
+        changes = {int(option.value): int(option.value) in selected for option in self.item.options
+                   if interaction.guild.get_role(int(option.value)) is not None}
+        interaction.client.get_cog('ReactionRoles').reaction_roles.request(interaction.user, changes)
+        await interaction.response.send_message("Your roles have been updated.", ephemeral=True)
+
+class ReactionRoles(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        carried = bot.carryover.pop(self.qualified_name, {})
+        self.reaction_roles = ReactionRoleBatcher(pending=carried.get('pending'), members=carried.get('members'))
+
+    async def cog_load(self):
+        self.bot.add_dynamic_items(ReactionRoleButton, ReactionRoleSelect)
+
+    async def cog_unload(self):
+        self.bot.remove_dynamic_items(ReactionRoleButton, ReactionRoleSelect)
+        # Share toggles still inside their debounce window so has_role() stays accurate
+        self.bot.carryover[self.qualified_name] = {'pending': self.reaction_roles.pending, 'members': self.reaction_roles.members}
+
+    # 17. Reaction Roles Setup
+    @app_commands.command(name="setup_reaction_role", description="Set up a reaction role panel")
+    @app_commands.checks.has_permissions(manage_roles=True)
+    @app_commands.guild_only()
+    @app_commands.describe(
+        roles=f"Role mentions or IDs (up to {REACTION_ROLE_MAX})",
+        menu="Use a select menu instead of one button per role",
+        message="Text shown above the panel"
+    )
+    async def setup_reaction_role(self, interaction: discord.Interaction, roles: str, menu: bool = False, message: str = None):
+        found = []
+        for role_id in dict.fromkeys(int(match) for match in re.findall(r'\d{15,20}', roles)):
+            role = interaction.guild.get_role(role_id)
+            if role is None or not role.is_assignable():
+                await interaction.response.send_message(f"I can't assign <@&{role_id}>; it must exist, not be managed and sit below my top role.", ephemeral=True)
+                return
+            found.append(role)
+        if not found or len(found) > REACTION_ROLE_MAX:
+            await interaction.response.send_message(f"Please mention between 1 and {REACTION_ROLE_MAX} roles.", ephemeral=True)
+            return
+
+        view = discord.ui.View(timeout=None)
+        if menu:
+            view.add_item(ReactionRoleSelect([discord.SelectOption(label=role.name[:100], value=str(role.id)) for role in found]))
+        else:
+            for role in found:
+                view.add_item(ReactionRoleButton(role.id, role.name[:80]))
+        names = ", ".join(role.name for role in found)
+        await interaction.response.send_message((message or f"Click to get or remove a role: {names}")[:MESSAGE_LIMIT], view=view)
+
+async def setup(bot):
+    await bot.add_cog(ReactionRoles(bot))
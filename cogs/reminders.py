@@ -0,0 +1,148 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from core.config import CLUSTER_COUNT, CLUSTER_ID, owns_guild
+from core.scheduling import DeadlineScheduler, parse_relative_time
+
+class ReminderScheduler:
+    """User reminders persisted through the state store and fired by a DeadlineScheduler.
+
+    Reminders are stored per user as (user_id, reminder_id) rows. Every
+    cluster indexes all of them but only schedules those for guilds it owns;
+    a user's rows are re-read before they are listed, cancelled or fired, so
+    reminders set or cancelled through another cluster are seen.
+    """
+
+    def __init__(self, bot, table):
+        self.bot = bot
+        self.table = table
+        self.reminders = {}
+        self.by_user = {}
+        self.scheduler = DeadlineScheduler(self._fire)
+        self._next_id = CLUSTER_ID + 1
+
+    async def load(self):
+        await self.bot.state.load_namespace(self.table.namespace)
+        for reminder in self.table.values():
+            self._index(reminder)
+        # Clusters hand out interleaved ids (CLUSTER_ID + 1, + CLUSTER_COUNT, ...) so they never collide
+        next_id = max(self.reminders, default=0) + 1
+        self._next_id = next_id + (CLUSTER_ID - (next_id - 1)) % CLUSTER_COUNT
+        print(f"Loaded {len(self.scheduler.deadlines)} reminder(s)")
+
+    def _index(self, reminder):
+        self.reminders[reminder['id']] = reminder
+        self.by_user.setdefault(reminder['user_id'], set()).add(reminder['id'])
+        if owns_guild(reminder.get('guild_id')) and reminder['id'] not in self.scheduler.deadlines:
+            self.scheduler.schedule(reminder['id'], reminder['time'])
+
+    def _unindex(self, reminder_id):
+        reminder = self.reminders.pop(reminder_id)
+        self.scheduler.cancel(reminder_id)
+        user_ids = self.by_user.get(reminder['user_id'])
+        if user_ids is not None:
+            user_ids.discard(reminder_id)
+            if not user_ids:
+                del self.by_user[reminder['user_id']]
+        return reminder
+
+    def add(self, user_id, guild_id, channel_id, due, message):
+        reminder = {
+            'id': self._next_id,
+            'user_id': user_id,
+            'guild_id': guild_id,
+            'channel_id': channel_id,
+            'time': due,
+            'message': message
+        }
+        self._next_id += CLUSTER_COUNT
+        self._index(reminder)
+        self.table[(user_id, reminder['id'])] = reminder
+        return reminder
+
+    async def _refresh(self, user_id):
+        """Re-read a user's reminders from storage and return the ids still pending."""
+        known = [(self.table, (user_id, reminder_id)) for reminder_id in self.by_user.get(user_id, ())]
+        found = await self.bot.state.refresh_scope(user_id, known)
+        pending = {reminder_id for _, reminder_id in found.get(self.table.namespace, ())}
+        for reminder_id in self.by_user.get(user_id, set()) - pending:
+            self._unindex(reminder_id)
+        for reminder_id in pending:
+            self._index(self.table[(user_id, reminder_id)])
+        return pending
+
+    async def cancel(self, user_id, reminder_id):
+        if reminder_id not in await self._refresh(user_id):
+            return False
+        self._unindex(reminder_id)
+        del self.table[(user_id, reminder_id)]
+        return True
+
+    async def for_user(self, user_id):
+        pending = await self._refresh(user_id)
+        return sorted((self.reminders[i] for i in pending), key=lambda r: r['time'])
+
+    def start(self):
+        self.scheduler.start()
+
+    def stop(self):
+        self.scheduler.stop()
+
+    async def _fire(self, reminder_id):
+        reminder = self.reminders.get(reminder_id)
+        # Skipped if it was cancelled through another cluster
+        if reminder is None or reminder_id not in await self._refresh(reminder['user_id']):
+            return
+        reminder = self._unindex(reminder_id)
+        del self.table[(reminder['user_id'], reminder_id)]
+        channel = self.bot.get_partial_messageable(reminder['channel_id'])
+        self.bot.outbound.send(channel, f"<@{reminder['user_id']}>, here's your reminder: {reminder['message']}")
+
+class Reminders(commands.Cog):
+    # 7. Reminder Commands
+    remind = app_commands.Group(name="remind", description="Manage your reminders")
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.reminders = ReminderScheduler(bot, bot.state.table('reminders', per_user=True))
+
+    async def cog_load(self):
+        await self.reminders.load()
+        self.reminders.start()
+
+    async def cog_unload(self):
+        self.reminders.stop()
+
+    @remind.command(name="set", description="Set a reminder")
+    async def remind_set(self, interaction: discord.Interaction, time: str, message: str):
+        try:
+            delta = parse_relative_time(time)
+        except ValueError:
+            await interaction.response.send_message("Invalid time format. Use a number followed by 'm' for minutes, 'h' for hours, or 'd' for days. For example: 30m, 2h, 1d (at most 365d)")
+            return
+
+        reminder_time = discord.utils.utcnow() + delta
+        reminder = self.reminders.add(interaction.user.id, interaction.guild_id, interaction.channel_id, reminder_time.timestamp(), message)
+        await interaction.response.send_message(f"I'll remind you about '{message}' in {time}. (Reminder #{reminder['id']})")
+
+    @remind.command(name="list", description="List your pending reminders")
+    async def remind_list(self, interaction: discord.Interaction):
+        reminders = await self.reminders.for_user(interaction.user.id)
+        if not reminders:
+            await interaction.response.send_message("You have no pending reminders.", ephemeral=True)
+            return
+        lines = [f"#{r['id']} <t:{int(r['time'])}:R>: {r['message']}" for r in reminders[:20]]
+        if len(reminders) > 20:
+            lines.append(f"...and {len(reminders) - 20} more")
+        await interaction.response.send_message("Your reminders:\n" + "\n".join(lines), ephemeral=True)
+
+    @remind.command(name="cancel", description="Cancel one of your reminders")
+    async def remind_cancel(self, interaction: discord.Interaction, reminder_id: int):
+        if await self.reminders.cancel(interaction.user.id, reminder_id):
+            await interaction.response.send_message(f"Cancelled reminder #{reminder_id}.", ephemeral=True)
+        else:
+            await interaction.response.send_message(f"Reminder #{reminder_id} not found.", ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(Reminders(bot))
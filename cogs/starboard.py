@@ -0,0 +1,133 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from core.scheduling import Debouncer
+
+STARBOARD_EMOJI = "⭐"
+STARBOARD_EDIT_DELAY = 3
+
+class StarboardManager:
+    """Keeps one starboard post per starred message.
+
+    Raw reaction events only mark a message dirty; after a short debounce
+    the message is fetched once, its star count read, and the existing post
+    is created, edited in place, or deleted when it drops below threshold.
+    Posts are indexed by (guild_id, source message id) in the state store.
+    """
+
+    def __init__(self, bot, config, posts):
+        self.bot = bot
+        self.config = config
+        self.posts = posts
+        self.refresher = Debouncer(STARBOARD_EDIT_DELAY, self._sync)
+
+    def on_reaction(self, payload, removed=False):
+        if payload.guild_id is None or str(payload.emoji) != STARBOARD_EMOJI:
+            return
+        self.touch(payload.guild_id, payload.channel_id, payload.message_id, removed)
+
+    def touch(self, guild_id, channel_id, message_id, removed=False):
+        if guild_id is None:
+            return
+        if not self.bot.state.request_scope(guild_id):
+            # The guild's state is still loading; _sync checks the config once it has
+            self.refresher.touch((guild_id, channel_id, message_id))
+            return
+        # Losing stars can only matter for messages that already have a post
+        if removed and (guild_id, message_id) not in self.posts:
+            return
+        config = self.config.get(guild_id)
+        if config is None or channel_id == config['channel']:
+            return
+        self.refresher.touch((guild_id, channel_id, message_id))
+
+    def embed(self, message, count):
+        # fetch_message() on a partial messageable leaves message.channel without a name
+        channel = self.bot.get_channel(message.channel.id)
+        embed = discord.Embed(description=message.content, color=discord.Color.gold())
+        embed.set_author(name=message.author.name, icon_url=message.author.display_avatar.url)
+        embed.add_field(name="Original", value=f"[Jump to message]({message.jump_url})")
+        embed.set_footer(text=f"{STARBOARD_EMOJI} {count} | {channel.name if channel else f'<#{message.channel.id}>'}")
+        if message.attachments:
+            embed.set_image(url=message.attachments[0].url)
+        return embed
+
+    async def _sync(self, key):
+        guild_id, channel_id, message_id = key
+        await self.bot.state.load_scope(guild_id)
+        config = self.config.get(guild_id)
+        if config is None or channel_id == config['channel']:
+            return
+        post = self.posts.get((guild_id, message_id))
+        starboard = self.bot.get_partial_messageable(config['channel'], guild_id=guild_id)
+        try:
+            message = await self.bot.get_partial_messageable(channel_id, guild_id=guild_id).fetch_message(message_id)
+        except discord.NotFound:
+            message = None
+        count = 0
+        if message is not None:
+            count = next((r.count for r in message.reactions if str(r.emoji) == STARBOARD_EMOJI), 0)
+
+        if count < config['threshold']:
+            if post is not None:
+                del self.posts[(guild_id, message_id)]
+                try:
+                    await starboard.get_partial_message(post['post_id']).delete()
+                except discord.NotFound:
+                    pass
+            return
+        if post is None:
+            sent = await self.bot.outbound.send(starboard, embed=self.embed(message, count))
+            self.posts[(guild_id, message_id)] = {'post_id': sent.id, 'count': count}
+        elif post['count'] != count:
+            try:
+                await starboard.get_partial_message(post['post_id']).edit(embed=self.embed(message, count))
+            except discord.NotFound:
+                # The post was deleted by hand; forget it so the next star re-posts
+                del self.posts[(guild_id, message_id)]
+                return
+            post['count'] = count
+            self.posts.save((guild_id, message_id))
+
+class Starboard(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.starboard = StarboardManager(
+            bot,
+            bot.state.table('starboard', per_guild=True),
+            bot.state.table('starboard_posts', per_guild=True)
+        )
+
+    # 22. Starboard
+    @app_commands.command(name="setup_starboard", description="Set up a starboard channel")
+    @app_commands.checks.has_permissions(manage_channels=True)
+    async def setup_starboard(self, interaction: discord.Interaction, channel: discord.TextChannel, threshold: int = 3):
+        threshold = max(threshold, 1)
+        self.starboard.config[interaction.guild.id] = {"channel": channel.id, "threshold": threshold}
+        await interaction.response.send_message(f"Starboard set up in {channel.mention} with a threshold of {threshold} stars.")
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload):
+        if payload.member is not None and payload.member.bot:
+            return
+        self.starboard.on_reaction(payload)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload):
+        self.starboard.on_reaction(payload, removed=True)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_clear(self, payload):
+        self.starboard.touch(payload.guild_id, payload.channel_id, payload.message_id, removed=True)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_clear_emoji(self, payload):
+        self.starboard.on_reaction(payload, removed=True)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload):
+        self.starboard.touch(payload.guild_id, payload.channel_id, payload.message_id, removed=True)
+
+async def setup(bot):
+    await bot.add_cog(Starboard(bot))
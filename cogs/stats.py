@@ -0,0 +1,265 @@
+import asyncio
+import time
+from collections import deque
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from core.cache import MISSING
+from core.utils import guild_members, role_ids
+
+STATS_SAMPLE_INTERVAL = 300
+STATS_RESYNC_INTERVAL = 1800
+STATS_HISTORY = 48
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+class GuildStats:
+    __slots__ = ('online', 'roles', 'history', 'synced_at')
+
+    def __init__(self, online, roles, history, synced_at):
+        self.online = online
+        self.roles = roles
+        self.history = history
+        self.synced_at = synced_at
+
+class GuildStatsAggregator:
+    """Online and per-role member counters kept current from gateway events.
+
+    A guild is scanned once (yielding to the event loop as it goes) and then
+    updated incrementally by join, leave, member update and presence events,
+    so /server_stats and /roleinfo read counters instead of walking every
+    member. Guilds without a complete member cache (lean mode) are tracked
+    only once load() has counted an uncached member chunk for them. Guilds
+    are rescanned every STATS_RESYNC_INTERVAL to correct drift, and a
+    (timestamp, members, online) sample is kept every STATS_SAMPLE_INTERVAL
+    for trend display.
+    """
+
+    def __init__(self, bot, guilds=None):
+        self.bot = bot
+        self.guilds = guilds if guilds is not None else {}
+        self._task = None
+
+    def get(self, guild):
+        return self.guilds.get(guild.id)
+
+    def tracks_presence(self):
+        return self.bot.intents.presences
+
+    def can_chunk(self):
+        return self.bot.intents.members
+
+    async def build(self, guild, members=None):
+        track_presence = self.tracks_presence()
+        online = 0
+        roles = {}
+        for i, member in enumerate(guild.members if members is None else members):
+            if track_presence and member.status is not discord.Status.offline:
+                online += 1
+            for role_id in role_ids(member):
+                roles[role_id] = roles.get(role_id, 0) + 1
+            if i % 1000 == 999:
+                await asyncio.sleep(0)
+        previous = self.guilds.get(guild.id)
+        history = previous.history if previous else deque(maxlen=STATS_HISTORY)
+        stats = GuildStats(online if track_presence else None, roles, history, time.time())
+        self.guilds[guild.id] = stats
+        if not history:
+            self.sample(guild, stats)
+        return stats
+
+    async def load(self, guild):
+        """Build a guild's counters from a member chunk that is not kept in the cache."""
+        return await self.build(guild, await guild_members(guild))
+
+    def sample(self, guild, stats):
+        stats.history.append((time.time(), guild.member_count, stats.online))
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def sync(self):
+        """Scan guilds that are new or due a resync and take a sample of each."""
+        now = time.time()
+        for guild in list(self.bot.guilds):
+            stats = self.guilds.get(guild.id)
+            if guild.chunked:
+                if stats is None or now - stats.synced_at >= STATS_RESYNC_INTERVAL:
+                    stats = await self.build(guild)
+            elif stats is not None and self.can_chunk():
+                if now - stats.synced_at >= STATS_RESYNC_INTERVAL:
+                    stats = await self.load(guild)
+            else:
+                continue
+            self.sample(guild, stats)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(STATS_SAMPLE_INTERVAL)
+            await self.sync()
+
+    def on_member_join(self, member):
+        stats = self.guilds.get(member.guild.id)
+        if stats is None:
+            return
+        for role_id in role_ids(member):
+            stats.roles[role_id] = stats.roles.get(role_id, 0) + 1
+        if stats.online is not None and member.status is not discord.Status.offline:
+            stats.online += 1
+
+    def on_member_remove(self, member):
+        stats = self.guilds.get(member.guild.id)
+        if stats is None:
+            return
+        for role_id in role_ids(member):
+            stats.roles[role_id] = max(stats.roles.get(role_id, 0) - 1, 0)
+        if stats.online is not None and member.status is not discord.Status.offline:
+            stats.online = max(stats.online - 1, 0)
+
+    def on_member_update(self, before, after):
+        stats = self.guilds.get(after.guild.id)
+        if stats is None:
+            return
+        old = role_ids(before)
+        new = role_ids(after)
+        for role_id in new - old:
+            stats.roles[role_id] = stats.roles.get(role_id, 0) + 1
+        for role_id in old - new:
+            stats.roles[role_id] = max(stats.roles.get(role_id, 0) - 1, 0)
+
+    def on_presence_update(self, before, after):
+        stats = self.guilds.get(after.guild.id)
+        if stats is None or stats.online is None:
+            return
+        was_online = before.status is not discord.Status.offline
+        is_online = after.status is not discord.Status.offline
+        if was_online != is_online:
+            stats.online += 1 if is_online else -1
+
+    def on_role_delete(self, role):
+        stats = self.guilds.get(role.guild.id)
+        if stats is not None:
+            stats.roles.pop(role.id, None)
+
+    def on_guild_remove(self, guild):
+        self.guilds.pop(guild.id, None)
+
+    def role_count(self, role):
+        if role.is_default():
+            return role.guild.member_count
+        stats = self.guilds.get(role.guild.id)
+        return stats.roles.get(role.id, 0) if stats else None
+
+def sparkline(values):
+    values = [v for v in values if v is not None]
+    if not values:
+        return None
+    low, high = min(values), max(values)
+    span = (high - low) or 1
+    return "".join(SPARK_CHARS[round((v - low) / span * (len(SPARK_CHARS) - 1))] for v in values)
+
+class Stats(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        # Counters are rebuilt from a full member scan, so keep them across a reload
+        carried = bot.carryover.pop(self.qualified_name, {})
+        self.guild_stats = GuildStatsAggregator(bot, carried.get('guilds'))
+
+    async def warm_up(self):
+        await self.guild_stats.sync()
+        self.guild_stats.start()
+
+    async def cog_unload(self):
+        self.guild_stats.stop()
+        self.bot.carryover[self.qualified_name] = {'guilds': self.guild_stats.guilds}
+
+    # 24. Server Stats
+    @app_commands.command(name="server_stats", description="Display server statistics")
+    async def server_stats(self, interaction: discord.Interaction):
+        guild = interaction.guild
+        embed = discord.Embed(title=f"{guild.name} Statistics", color=discord.Color.blue())
+        embed.add_field(name="Total Members", value=guild.member_count, inline=True)
+        stats = self.guild_stats.get(guild)
+        if stats is not None and stats.online is not None:
+            online = stats.online
+        else:
+            online = (await self.bot.fetch_guild(guild.id, with_counts=True)).approximate_presence_count
+        embed.add_field(name="Online Members", value=online, inline=True)
+        embed.add_field(name="Text Channels", value=len(guild.text_channels), inline=True)
+        embed.add_field(name="Voice Channels", value=len(guild.voice_channels), inline=True)
+        embed.add_field(name="Roles", value=len(guild.roles), inline=True)
+        embed.add_field(name="Emojis", value=len(guild.emojis), inline=True)
+        if stats is not None and len(stats.history) > 1:
+            first = stats.history[0]
+            trend = sparkline(sample[2] for sample in stats.history)
+            if trend:
+                embed.add_field(name="Online Trend", value=f"`{trend}`", inline=False)
+            embed.add_field(name="Member Change", value=f"{guild.member_count - first[1]:+d} since <t:{int(first[0])}:R>", inline=False)
+        await interaction.response.send_message(embed=embed)
+
+    # 25. Role Info
+    @app_commands.command(name="roleinfo", description="Get information about a role")
+    async def roleinfo(self, interaction: discord.Interaction, role: discord.Role):
+        key = ('roleinfo', role.guild.id, role.id)
+        embed = self.bot.cache.get(key)
+        if embed is not MISSING:
+            await interaction.response.send_message(embed=embed)
+            return
+        member_count = self.guild_stats.role_count(role)
+        if member_count is None:
+            if interaction.guild.chunked:
+                member_count = len(role.members)
+            elif self.guild_stats.can_chunk():
+                # Lean mode: count from an uncached chunk; the counters then stay current
+                await interaction.response.defer()
+                await self.guild_stats.load(interaction.guild)
+                member_count = self.guild_stats.role_count(role)
+            else:
+                member_count = "Unknown"
+        embed = discord.Embed(title=f"Role Information: {role.name}", color=role.color)
+        embed.add_field(name="ID", value=role.id, inline=True)
+        embed.add_field(name="Created At", value=role.created_at.strftime("%Y-%m-%d"), inline=True)
+        embed.add_field(name="Members", value=member_count, inline=True)
+        embed.add_field(name="Mentionable", value=role.mentionable, inline=True)
+        embed.add_field(name="Hoisted", value=role.hoist, inline=True)
+        embed.add_field(name="Position", value=role.position, inline=True)
+        # Short TTL: member counts move with every join and role change
+        self.bot.cache.set(key, embed, 30, [('role', role.guild.id, role.id)])
+        if interaction.response.is_done():
+            await interaction.followup.send(embed=embed)
+        else:
+            await interaction.response.send_message(embed=embed)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        self.guild_stats.on_member_join(member)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        self.guild_stats.on_member_remove(member)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        self.guild_stats.on_member_update(before, after)
+
+    @commands.Cog.listener()
+    async def on_presence_update(self, before, after):
+        self.guild_stats.on_presence_update(before, after)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        self.guild_stats.on_role_delete(role)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.guild_stats.on_guild_remove(guild)
+
+async def setup(bot):
+    await bot.add_cog(Stats(bot))
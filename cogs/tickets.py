@@ -0,0 +1,203 @@
+import asyncio
+import contextlib
+import io
+import re
+import time
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+TICKET_CHANNEL_NAME = re.compile(r'ticket-(\d+)')
+
+class TicketRegistry:
+    """Open tickets indexed by (guild, channel) and by (guild, owner).
+
+    Both indexes are persisted, so the duplicate-ticket check is a dict
+    lookup that survives restarts and channel renames. A per-owner lock
+    keeps double clicks from creating two channels; each lock is counted
+    by its holders and waiters and dropped once none are left.
+    """
+
+    def __init__(self, tickets, owners, locks=None):
+        self.tickets = tickets
+        self.owners = owners
+        self.locks = {} if locks is None else locks
+
+    @contextlib.asynccontextmanager
+    async def lock(self, guild_id, user_id):
+        key = (guild_id, user_id)
+        entry = self.locks.get(key)
+        if entry is None:
+            entry = self.locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self.locks[key]
+
+    def open_ticket(self, guild, user_id):
+        """Return the owner's open ticket channel, dropping entries whose channel is gone."""
+        channel_id = self.owners.get((guild.id, user_id))
+        if channel_id is None:
+            return None
+        channel = guild.get_channel(channel_id)
+        if channel is None:
+            self.remove(guild.id, channel_id)
+        return channel
+
+    def get(self, guild_id, channel_id):
+        return self.tickets.get((guild_id, channel_id))
+
+    def add(self, guild_id, channel_id, user_id):
+        self.tickets[(guild_id, channel_id)] = {'user_id': user_id, 'claimed_by': None, 'opened_at': time.time()}
+        self.owners[(guild_id, user_id)] = channel_id
+
+    def claim(self, guild_id, channel_id, staff_id):
+        ticket = self.tickets[(guild_id, channel_id)]
+        ticket['claimed_by'] = staff_id
+        self.tickets.save((guild_id, channel_id))
+
+    def remove(self, guild_id, channel_id):
+        ticket = self.tickets.pop((guild_id, channel_id), None)
+        if ticket is not None and self.owners.get((guild_id, ticket['user_id'])) == channel_id:
+            del self.owners[(guild_id, ticket['user_id'])]
+        return ticket
+
+    def on_channel_create(self, channel):
+        # Adopt ticket channels made by hand so the duplicate check sees them
+        match = TICKET_CHANNEL_NAME.fullmatch(channel.name)
+        if match and self.get(channel.guild.id, channel.id) is None:
+            user_id = int(match.group(1))
+            if (channel.guild.id, user_id) not in self.owners:
+                self.add(channel.guild.id, channel.id, user_id)
+
+    def on_channel_delete(self, channel):
+        self.remove(channel.guild.id, channel.id)
+
+async def build_transcript(channel):
+    """Stream a channel's history into a text file without holding the messages."""
+    buffer = io.StringIO()
+    async for message in channel.history(limit=None, oldest_first=True):
+        buffer.write(f"[{message.created_at:%Y-%m-%d %H:%M:%S}] {message.author}: {message.content}\n")
+        for attachment in message.attachments:
+            buffer.write(f"    attachment: {attachment.url}\n")
+    return discord.File(io.BytesIO(buffer.getvalue().encode()), filename=f"transcript-{channel.name}.txt")
+
+class TicketView(discord.ui.View):
+    def __init__(self, tickets):
+        super().__init__(timeout=None)
+        self.tickets = tickets
+
+    @discord.ui.button(label="Create Ticket", style=discord.ButtonStyle.green, custom_id="create_ticket")
+    async def create_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
+        guild = interaction.guild
+        member = interaction.user
+        await interaction.response.defer(ephemeral=True)
+        await interaction.client.state.load_scope(guild.id)
+        async with self.tickets.lock(guild.id, member.id):
+            existing_ticket = self.tickets.open_ticket(guild, member.id)
+            if existing_ticket:
+                await interaction.followup.send(f"You already have an open ticket: {existing_ticket.mention}", ephemeral=True)
+                return
+
+            overwrites = {
+                guild.default_role: discord.PermissionOverwrite(read_messages=False),
+                member: discord.PermissionOverwrite(read_messages=True, send_messages=True),
+                guild.me: discord.PermissionOverwrite(read_messages=True, send_messages=True, manage_channels=True)
+            }
+
+            try:
+                channel = await guild.create_text_channel(f'ticket-{member.id}', overwrites=overwrites, category=interaction.channel.category)
+            except discord.HTTPException as e:
+                print(f"Could not create ticket channel for {member.id}: {e}")
+                await interaction.followup.send("Couldn't create a ticket channel. Please ask staff to check my permissions.", ephemeral=True)
+                return
+            self.tickets.add(guild.id, channel.id, member.id)
+        interaction.client.outbound.send(channel, f"{member.mention} has created a ticket. Staff will be with you shortly.", view=TicketControlView(self.tickets))
+        await interaction.followup.send(f"Ticket created: {channel.mention}", ephemeral=True)
+
+class TicketControlView(discord.ui.View):
+    def __init__(self, tickets):
+        super().__init__(timeout=None)
+        self.tickets = tickets
+
+    @staticmethod
+    def is_staff(interaction: discord.Interaction):
+        return interaction.permissions.manage_channels
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        await interaction.client.state.load_scope(interaction.guild.id)
+        if self.tickets.get(interaction.guild.id, interaction.channel_id) is None:
+            await interaction.response.send_message("This channel is no longer a registered ticket.", ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.button(label="Close", style=discord.ButtonStyle.danger, custom_id="ticket_close")
+    async def close_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
+        ticket = self.tickets.get(interaction.guild.id, interaction.channel_id)
+        if interaction.user.id != ticket['user_id'] and not self.is_staff(interaction):
+            await interaction.response.send_message("Only the ticket owner or staff can close this ticket.", ephemeral=True)
+            return
+        await interaction.response.send_message("Closing ticket...")
+        self.tickets.remove(interaction.guild.id, interaction.channel_id)
+        await interaction.channel.delete(reason=f"Ticket closed by {interaction.user}")
+
+    @discord.ui.button(label="Claim", style=discord.ButtonStyle.primary, custom_id="ticket_claim")
+    async def claim_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if not self.is_staff(interaction):
+            await interaction.response.send_message("Only staff can claim tickets.", ephemeral=True)
+            return
+        ticket = self.tickets.get(interaction.guild.id, interaction.channel_id)
+        if ticket['claimed_by'] is not None:
+            await interaction.response.send_message(f"This ticket is already claimed by <@{ticket['claimed_by']}>.", ephemeral=True)
+            return
+        self.tickets.claim(interaction.guild.id, interaction.channel_id, interaction.user.id)
+        await interaction.response.send_message(f"{interaction.user.mention} has claimed this ticket.")
+
+    @discord.ui.button(label="Transcript", style=discord.ButtonStyle.secondary, custom_id="ticket_transcript")
+    async def ticket_transcript(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.defer(ephemeral=True)
+        transcript = await build_transcript(interaction.channel)
+        await interaction.followup.send("Here is the transcript of this ticket.", file=transcript, ephemeral=True)
+
+class Tickets(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.tickets = TicketRegistry(
+            bot.state.table('tickets', per_guild=True),
+            bot.state.table('ticket_owners', per_guild=True),
+            bot.carryover.pop(self.qualified_name, None)
+        )
+
+    async def cog_load(self):
+        # Re-registering replaces the previous views' handlers for these custom ids
+        self.bot.add_view(TicketView(self.tickets))
+        self.bot.add_view(TicketControlView(self.tickets))
+
+    async def cog_unload(self):
+        self.bot.carryover[self.qualified_name] = self.tickets.locks
+
+    # 18. Ticket System
+    @app_commands.command(name="setup_ticket_system", description="Set up the ticket system")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def setup_ticket_system(self, interaction: discord.Interaction):
+        embed = discord.Embed(title="Support Ticket System", description="Click the button below to create a support ticket.")
+        view = TicketView(self.tickets)
+        await interaction.channel.send(embed=embed, view=view)
+        await interaction.response.send_message("Ticket system set up successfully!", ephemeral=True)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        if isinstance(channel, discord.TextChannel):
+            self.tickets.on_channel_create(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self.tickets.on_channel_delete(channel)
+
+async def setup(bot):
+    await bot.add_cog(Tickets(bot))
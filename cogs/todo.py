@@ -0,0 +1,194 @@
+import itertools
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from core.config import CLUSTER_COUNT, CLUSTER_ID
+from core.scheduling import parse_relative_time
+
+TODO_PAGE_SIZE = 10
+# Keeps a full page comfortably under the 2000 character message limit
+TODO_MAX_LENGTH = 150
+
+class TodoStore:
+    """Per-user todo items keyed by (user_id, item_id).
+
+    Item ids are per user and never shift or get reused when items are
+    removed. ``last_ids`` persists the last id each cluster handed to each
+    user, and clusters hand out interleaved ids (CLUSTER_ID + 1,
+    + CLUSTER_COUNT, ...) so they never collide. ``by_user`` keeps each
+    user's items in id order so a page can be sliced without touching
+    anyone else's list.
+
+    Both tables are stored per user. Items can be changed through any
+    cluster, so each command re-reads the user's rows with refresh() first.
+    """
+
+    def __init__(self, table, last_ids):
+        self.table = table
+        self.last_ids = last_ids
+        self.by_user = {}
+        self._highest = {}
+
+    async def refresh(self, user_id):
+        known = [(self.table, (user_id, item_id)) for item_id in self.items(user_id)]
+        found = await self.table.store.refresh_scope(user_id, known)
+        items = {item_id: self.table[(user_id, item_id)] for _, item_id in sorted(found.get(self.table.namespace, ()))}
+        if items:
+            self.by_user[user_id] = items
+        else:
+            self.by_user.pop(user_id, None)
+        last_ids = [self.last_ids[key] for key in found.get(self.last_ids.namespace, ())]
+        self._highest[user_id] = max(itertools.chain(items, last_ids, [self._highest.get(user_id, 0)]))
+
+    def items(self, user_id):
+        return self.by_user.get(user_id, {})
+
+    def _next_id(self, user_id):
+        next_id = self._highest.get(user_id, 0) + 1
+        next_id += (CLUSTER_ID - (next_id - 1)) % CLUSTER_COUNT
+        self._highest[user_id] = next_id
+        self.last_ids[(user_id, CLUSTER_ID)] = next_id
+        return next_id
+
+    def add(self, user_id, text, due=None):
+        items = self.by_user.setdefault(user_id, {})
+        item_id = self._next_id(user_id)
+        item = {'id': item_id, 'text': text, 'done': False, 'due': due}
+        items[item_id] = item
+        self.table[(user_id, item_id)] = item
+        return item
+
+    def get(self, user_id, item_id):
+        return self.items(user_id).get(item_id)
+
+    def set_done(self, user_id, item_id, done):
+        item = self.get(user_id, item_id)
+        if item is not None:
+            item['done'] = done
+            self.table.save((user_id, item_id))
+        return item
+
+    def remove(self, user_id, item_id):
+        items = self.by_user.get(user_id)
+        if not items or item_id not in items:
+            return None
+        item = items.pop(item_id)
+        del self.table[(user_id, item_id)]
+        if not items:
+            del self.by_user[user_id]
+        return item
+
+    def clear_done(self, user_id):
+        done = [item_id for item_id, item in self.items(user_id).items() if item['done']]
+        for item_id in done:
+            self.remove(user_id, item_id)
+        return len(done)
+
+    def page_count(self, user_id):
+        return max(1, -(-len(self.items(user_id)) // TODO_PAGE_SIZE))
+
+    def page(self, user_id, page):
+        start = page * TODO_PAGE_SIZE
+        items = self.items(user_id).values()
+        return list(itertools.islice(items, start, start + TODO_PAGE_SIZE))
+
+def render_todo_page(todos, user_id, page):
+    items = todos.items(user_id)
+    if not items:
+        return "Your todo list is empty."
+    pages = todos.page_count(user_id)
+    lines = []
+    for item in todos.page(user_id, page):
+        line = f"{'✅' if item['done'] else '⬜'} `#{item['id']}` {item['text']}"
+        if item['due'] and not item['done']:
+            line += f" (due <t:{int(item['due'])}:R>)"
+        lines.append(line)
+    done = sum(1 for item in items.values() if item['done'])
+    return f"Your todo list ({done}/{len(items)} done, page {page + 1}/{pages}):\n" + "\n".join(lines)
+
+class TodoPageView(discord.ui.View):
+    def __init__(self, todos, user_id, page=0):
+        super().__init__(timeout=300)
+        self.todos = todos
+        self.user_id = user_id
+        self.page = page
+        self.update_buttons()
+
+    def update_buttons(self):
+        pages = self.todos.page_count(self.user_id)
+        self.page = min(self.page, pages - 1)
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= pages - 1
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        return interaction.user.id == self.user_id
+
+    async def show(self, interaction: discord.Interaction, page):
+        await self.todos.refresh(self.user_id)
+        self.page = page
+        self.update_buttons()
+        await interaction.response.edit_message(content=render_todo_page(self.todos, self.user_id, self.page), view=self)
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.page - 1)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.page + 1)
+
+class Todo(commands.Cog):
+    # 8. Todo List Commands
+    todo = app_commands.Group(name="todo", description="Manage your todo list")
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.todos = TodoStore(bot.state.table('todo_items', per_user=True), bot.state.table('todo_last_ids', per_user=True))
+
+    @todo.command(name="add", description="Add an item to your todo list")
+    @app_commands.describe(due="Optional due time, e.g. 30m, 2h or 1d")
+    async def todo_add(self, interaction: discord.Interaction, item: app_commands.Range[str, 1, TODO_MAX_LENGTH], due: str = None):
+        due_at = None
+        if due:
+            try:
+                due_at = (discord.utils.utcnow() + parse_relative_time(due)).timestamp()
+            except ValueError:
+                await interaction.response.send_message("Invalid due time. Use a number followed by 'm', 'h' or 'd', e.g. 30m, 2h, 1d (at most 365d).", ephemeral=True)
+                return
+        await self.todos.refresh(interaction.user.id)
+        entry = self.todos.add(interaction.user.id, item, due_at)
+        await interaction.response.send_message(f"Added '{item}' to your todo list as #{entry['id']}.", ephemeral=True)
+
+    @todo.command(name="list", description="Show your todo list")
+    async def todo_list(self, interaction: discord.Interaction, page: int = 1):
+        await self.todos.refresh(interaction.user.id)
+        view = TodoPageView(self.todos, interaction.user.id, max(page, 1) - 1)
+        await interaction.response.send_message(render_todo_page(self.todos, interaction.user.id, view.page), view=view, ephemeral=True)
+
+    @todo.command(name="done", description="Mark a todo item as done (or not done)")
+    async def todo_done(self, interaction: discord.Interaction, item_id: int, done: bool = True):
+        await self.todos.refresh(interaction.user.id)
+        if self.todos.set_done(interaction.user.id, item_id, done) is None:
+            await interaction.response.send_message(f"Todo #{item_id} not found.", ephemeral=True)
+            return
+        await interaction.response.send_message(f"Marked #{item_id} as {'done' if done else 'not done'}.", ephemeral=True)
+
+    @todo.command(name="remove", description="Remove an item from your todo list")
+    async def todo_remove(self, interaction: discord.Interaction, item_id: int):
+        await self.todos.refresh(interaction.user.id)
+        item = self.todos.remove(interaction.user.id, item_id)
+        if item is None:
+            await interaction.response.send_message(f"Todo #{item_id} not found.", ephemeral=True)
+            return
+        await interaction.response.send_message(f"Removed '{item['text']}' from your todo list.", ephemeral=True)
+
+    @todo.command(name="clear", description="Remove all completed items from your todo list")
+    async def todo_clear(self, interaction: discord.Interaction):
+        await self.todos.refresh(interaction.user.id)
+        count = self.todos.clear_done(interaction.user.id)
+        await interaction.response.send_message(f"Removed {count} completed item(s).", ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(Todo(bot))
@@ -0,0 +1 @@
+"""Infrastructure shared by the bot process and its extensions."""
@@ -0,0 +1,89 @@
+"""Response cache for info embeds and REST lookups."""
+import os
+import time
+from collections import OrderedDict
+
+import discord
+
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '5000'))
+EMBED_TTL = 60
+FETCH_TTL = 600
+NEGATIVE_TTL = 60
+MISSING = object()
+
+class _CachedNotFound:
+    """Stand-in HTTP response for replaying a cached 404."""
+    status = 404
+    reason = "Not Found"
+
+class ResponseCache:
+    """Bounded LRU cache with per-entry TTLs and tag-based invalidation.
+
+    Entries are tagged with the objects they were built from, e.g.
+    ('guild', id) or ('member', guild_id, user_id); gateway update events
+    invalidate a tag and every entry carrying it.
+    """
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.tags = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None or entry[1] < time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return MISSING
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key, value, ttl, tags=()):
+        if key in self.entries:
+            self._remove(key)
+        self.entries[key] = (value, time.monotonic() + ttl, tuple(tags))
+        for tag in tags:
+            self.tags.setdefault(tag, set()).add(key)
+        while len(self.entries) > self.max_entries:
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+
+    def _remove(self, key):
+        _, _, tags = self.entries.pop(key)
+        for tag in tags:
+            keys = self.tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tags[tag]
+
+    def invalidate(self, *tags):
+        for tag in tags:
+            for key in list(self.tags.get(tag, ())):
+                self._remove(key)
+
+    def cached(self, key, ttl, tags, build):
+        value = self.get(key)
+        if value is MISSING:
+            value = build()
+            self.set(key, value, ttl, tags)
+        return value
+
+    async def fetch(self, key, ttl, tags, fetcher):
+        """Cache a REST lookup; NotFound is cached briefly as None."""
+        value = self.get(key)
+        if value is MISSING:
+            try:
+                value = await fetcher()
+            except discord.NotFound:
+                self.set(key, None, NEGATIVE_TTL, tags)
+                raise
+            self.set(key, value, ttl, tags)
+        elif value is None:
+            raise discord.NotFound(_CachedNotFound(), "Unknown (cached)")
+        return value
@@ -0,0 +1,74 @@
+"""Environment configuration shared by the bot process and its extensions."""
+import os
+import time
+
+import discord
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+TOKEN = os.getenv('DISCORD_TOKEN')
+
+# Sharding: SHARD_COUNT > 0 switches to AutoShardedBot. With CLUSTER_COUNT > 1,
+# `python bot.py` launches one worker process per cluster, each owning a
+# contiguous range of shards and sharing the SQLite state file.
+SHARD_COUNT = int(os.getenv('SHARD_COUNT', '0'))
+CLUSTER_COUNT = max(int(os.getenv('CLUSTER_COUNT', '1')), 1)
+CLUSTER_ID = int(os.getenv('CLUSTER_ID', '0'))
+
+def cluster_shards(cluster_id):
+    per_cluster = -(-SHARD_COUNT // CLUSTER_COUNT)
+    return list(range(cluster_id * per_cluster, min((cluster_id + 1) * per_cluster, SHARD_COUNT)))
+
+SHARD_IDS = cluster_shards(CLUSTER_ID) if SHARD_COUNT else None
+
+def owns_guild(guild_id):
+    """Whether this process handles a guild's events (DMs are handled by shard 0)."""
+    if not SHARD_COUNT:
+        return True
+    shard_id = (guild_id >> 22) % SHARD_COUNT if guild_id else 0
+    return shard_id in SHARD_IDS
+
+# Commands are also synced to this guild, where changes show up instantly
+DEV_GUILD_ID = int(os.getenv('DEV_GUILD_ID', '0')) or None
+STARTED_AT = time.monotonic()
+
+# Lean mode enables only the intents BOT_FEATURES need and trims the caches
+LEAN_MODE = os.getenv('LEAN_MODE', '').lower() in ('1', 'true', 'yes')
+LEAN_MESSAGE_CACHE = int(os.getenv('LEAN_MESSAGE_CACHE', '200'))
+BOT_FEATURES = {f.strip() for f in os.getenv('BOT_FEATURES', 'welcome,starboard,custom_commands,afk,stats').split(',') if f.strip()}
+
+# Gateway intents each optional feature needs on top of the guild intents
+FEATURE_INTENTS = {
+    'welcome': ('members',),
+    'starboard': ('guild_reactions',),
+    'custom_commands': ('guild_messages', 'message_content'),
+    'afk': ('guild_messages', 'message_content'),
+    'stats': ('presences', 'members'),
+}
+
+# What behaves differently when LEAN_MODE is on
+LEAN_DEGRADED = [
+    "stats: online counts come from Discord's approximate presence count (no presence intent)",
+    "members: role counts come from an uncached member chunk taken on first use (/roleinfo)",
+    f"messages: only the last {LEAN_MESSAGE_CACHE} messages are cached",
+]
+
+def build_intents():
+    if not LEAN_MODE:
+        return discord.Intents.all()
+    intents = discord.Intents.none()
+    intents.guilds = True
+    intents.emojis_and_stickers = True
+    for feature in BOT_FEATURES:
+        for flag in FEATURE_INTENTS.get(feature, ()):
+            # Presences are the single biggest memory cost; lean mode never enables them
+            if flag != 'presences':
+                setattr(intents, flag, True)
+    return intents
+
+intents = build_intents()
+
+STATE_BACKEND = os.getenv('STATE_BACKEND', 'sqlite')
+STATE_PATH = os.getenv('STATE_PATH', 'bot_state.db')
+STATE_FLUSH_INTERVAL = float(os.getenv('STATE_FLUSH_INTERVAL', '5'))
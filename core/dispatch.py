@@ -0,0 +1,140 @@
+"""Paced, coalescing per-channel message sends."""
+import asyncio
+from collections import deque
+
+import discord
+
+from core.utils import spawn
+
+MESSAGE_LIMIT = 2000
+# Discord allows 5 message creates per 5 seconds per channel
+SEND_BUCKET_SIZE = 5
+SEND_BUCKET_WINDOW = 5.0
+
+class OutboundMessage:
+    __slots__ = ('content', 'kwargs', 'future', 'queued_at')
+
+    def __init__(self, content, kwargs, future, queued_at):
+        self.content = content
+        self.kwargs = kwargs
+        self.future = future
+        self.queued_at = queued_at
+
+    def mergeable_with(self, other):
+        if self.content is None or other.content is None:
+            return False
+        if self.kwargs.keys() - {'allowed_mentions'} or other.kwargs.keys() - {'allowed_mentions'}:
+            return False
+        mine = self.kwargs.get('allowed_mentions')
+        theirs = other.kwargs.get('allowed_mentions')
+        if mine is None or theirs is None:
+            return mine is theirs
+        return mine.to_dict() == theirs.to_dict()
+
+class OutboundDispatcher:
+    """Per-channel send queues drained by one worker per busy channel.
+
+    Queued plain-text messages for the same channel are merged up to the
+    2000 character limit, and each channel is paced to its send bucket so
+    bursts wait here instead of hitting 429s. ``send`` returns a future that
+    callers may await for the Message or simply ignore.
+    """
+
+    def __init__(self):
+        self.queues = {}
+        self.channels = {}
+        self.drains = set()
+        self.recent_sends = {}
+        self.sent = 0
+        self.merged = 0
+        self.failed = 0
+        self.rate_limited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def send(self, channel, content=None, **kwargs):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        future.add_done_callback(self._consume_error)
+        queue = self.queues.get(channel.id)
+        if queue is None:
+            if len(self.recent_sends) > 1000:
+                self._prune_buckets(loop.time())
+            queue = self.queues[channel.id] = deque()
+            self.channels[channel.id] = channel
+            spawn(self.drains, self._drain(channel.id))
+        queue.append(OutboundMessage(None if content is None else str(content), kwargs, future, loop.time()))
+        return future
+
+    def _prune_buckets(self, now):
+        self.recent_sends = {
+            channel_id: recent for channel_id, recent in self.recent_sends.items()
+            if channel_id in self.queues or now - recent[-1] < SEND_BUCKET_WINDOW
+        }
+
+    @staticmethod
+    def _consume_error(future):
+        if not future.cancelled():
+            future.exception()
+
+    def depth(self):
+        return sum(len(queue) for queue in self.queues.values())
+
+    def stats(self):
+        return {
+            'queued': self.depth(),
+            'channels': len(self.queues),
+            'sent': self.sent,
+            'merged': self.merged,
+            'failed': self.failed,
+            'rate_limited': self.rate_limited,
+            'avg_wait': self.total_wait / self.sent if self.sent else 0.0,
+            'max_wait': self.max_wait
+        }
+
+    async def _wait_for_slot(self, channel_id):
+        loop = asyncio.get_running_loop()
+        recent = self.recent_sends.setdefault(channel_id, deque(maxlen=SEND_BUCKET_SIZE))
+        if len(recent) == SEND_BUCKET_SIZE:
+            delay = recent[0] + SEND_BUCKET_WINDOW - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        recent.append(loop.time())
+
+    async def _drain(self, channel_id):
+        loop = asyncio.get_running_loop()
+        queue = self.queues[channel_id]
+        channel = self.channels[channel_id]
+        try:
+            while queue:
+                batch = [queue.popleft()]
+                length = len(batch[0].content or '')
+                while queue and batch[0].mergeable_with(queue[0]) and length + 1 + len(queue[0].content) <= MESSAGE_LIMIT:
+                    length += 1 + len(queue[0].content)
+                    batch.append(queue.popleft())
+                await self._wait_for_slot(channel_id)
+                now = loop.time()
+                for item in batch:
+                    wait = now - item.queued_at
+                    self.total_wait += wait
+                    self.max_wait = max(self.max_wait, wait)
+                content = batch[0].content if len(batch) == 1 else "\n".join(item.content for item in batch)
+                try:
+                    message = await channel.send(content, **batch[0].kwargs)
+                except Exception as e:
+                    self.failed += 1
+                    if isinstance(e, discord.HTTPException) and e.status == 429:
+                        self.rate_limited += 1
+                    print(f"Failed to send to channel {channel_id}: {e}")
+                    for item in batch:
+                        if not item.future.done():
+                            item.future.set_exception(e)
+                else:
+                    self.sent += len(batch)
+                    self.merged += len(batch) - 1
+                    for item in batch:
+                        if not item.future.done():
+                            item.future.set_result(message)
+        finally:
+            del self.queues[channel_id]
+            del self.channels[channel_id]
@@ -0,0 +1,187 @@
+"""Prometheus metrics and health endpoints."""
+import asyncio
+import bisect
+import functools
+import logging
+import os
+import time
+
+import discord
+from aiohttp import web
+from discord import app_commands
+
+METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+METRICS_HOST = os.getenv('METRICS_HOST', '0.0.0.0')
+METRICS_ENABLED = METRICS_PORT > 0
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LOOP_LAG_INTERVAL = 0.5
+# /healthz fails once the event loop has been this far behind
+HEALTH_MAX_LOOP_LAG = 5.0
+
+class Histogram:
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class RateLimitCounter(logging.Handler):
+    """Counts the rate-limit warnings discord.py's HTTP client logs."""
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.hits = 0
+
+    def emit(self, record):
+        if 'rate limit' in record.getMessage().lower():
+            self.hits += 1
+
+class Metrics:
+    """Handler latency histograms and bot gauges, served as Prometheus text.
+
+    Event handlers are wrapped by ``instrument`` when they are registered and
+    app commands are timed through the command tree hooks; with
+    METRICS_PORT unset nothing is wrapped.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.histograms = {}
+        self.errors = {}
+        self.loop_lag = 0.0
+        self.rate_limits = RateLimitCounter()
+        self._runner = None
+        self._lag_task = None
+
+    def observe(self, kind, name, seconds, failed=False):
+        key = (kind, name)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(seconds)
+        if failed:
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def instrument(self, kind, name, func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception:
+                self.observe(kind, name, time.perf_counter() - start, failed=True)
+                raise
+            self.observe(kind, name, time.perf_counter() - start)
+            return result
+        return wrapper
+
+    async def _sample_loop_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LOOP_LAG_INTERVAL)
+            self.loop_lag = max(loop.time() - start - LOOP_LAG_INTERVAL, 0.0)
+
+    def render(self):
+        lines = [
+            "# HELP bot_handler_seconds Time spent in event handlers and app commands.",
+            "# TYPE bot_handler_seconds histogram",
+        ]
+        for (kind, name), histogram in sorted(self.histograms.items()):
+            labels = f'kind="{kind}",name="{name}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, histogram.counts):
+                cumulative += count
+                lines.append(f'bot_handler_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'bot_handler_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f'bot_handler_seconds_sum{{{labels}}} {histogram.sum}')
+            lines.append(f'bot_handler_seconds_count{{{labels}}} {histogram.count}')
+        lines += ["# HELP bot_handler_errors_total Handler invocations that raised.", "# TYPE bot_handler_errors_total counter"]
+        for (kind, name), count in sorted(self.errors.items()):
+            lines.append(f'bot_handler_errors_total{{kind="{kind}",name="{name}"}} {count}')
+
+        lines += ["# HELP bot_event_loop_lag_seconds Latest event loop scheduling delay.", "# TYPE bot_event_loop_lag_seconds gauge"]
+        lines.append(f"bot_event_loop_lag_seconds {self.loop_lag}")
+        lines += ["# HELP bot_gateway_latency_seconds Heartbeat latency per shard.", "# TYPE bot_gateway_latency_seconds gauge"]
+        latencies = getattr(self.bot, 'latencies', None) or [(0, self.bot.latency)]
+        for shard_id, latency in latencies:
+            if latency == latency:
+                lines.append(f'bot_gateway_latency_seconds{{shard="{shard_id}"}} {latency}')
+
+        outbound = self.bot.outbound.stats()
+        lines += [
+            "# TYPE bot_outbound_queue_depth gauge",
+            f"bot_outbound_queue_depth {outbound['queued']}",
+            "# TYPE bot_outbound_wait_seconds_max gauge",
+            f"bot_outbound_wait_seconds_max {outbound['max_wait']}",
+            "# TYPE bot_outbound_messages_total counter",
+            f"bot_outbound_messages_total {outbound['sent']}",
+            "# TYPE bot_outbound_merged_total counter",
+            f"bot_outbound_merged_total {outbound['merged']}",
+            "# HELP bot_rate_limit_hits_total 429 responses seen by the send queue and discord.py.",
+            "# TYPE bot_rate_limit_hits_total counter",
+            f"bot_rate_limit_hits_total {outbound['rate_limited'] + self.rate_limits.hits}",
+            "# TYPE bot_guilds gauge",
+            f"bot_guilds {len(self.bot.guilds)}",
+            "# TYPE bot_cache_hits_total counter",
+            f"bot_cache_hits_total {self.bot.cache.hits}",
+            "# TYPE bot_cache_misses_total counter",
+            f"bot_cache_misses_total {self.bot.cache.misses}",
+            "# TYPE bot_cache_evictions_total counter",
+            f"bot_cache_evictions_total {self.bot.cache.evictions}",
+            "# TYPE bot_cache_entries gauge",
+            f"bot_cache_entries {len(self.bot.cache.entries)}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    async def handle_metrics(self, request):
+        return web.Response(text=self.render(), content_type='text/plain', charset='utf-8')
+
+    async def handle_health(self, request):
+        healthy = self.bot.is_ready() and not self.bot.is_closed() and self.loop_lag < HEALTH_MAX_LOOP_LAG
+        body = {'ready': self.bot.is_ready(), 'loop_lag': self.loop_lag, 'guilds': len(self.bot.guilds)}
+        return web.json_response(body, status=200 if healthy else 503)
+
+    async def start(self):
+        if self._runner is not None:
+            return
+        logging.getLogger('discord.http').addHandler(self.rate_limits)
+        self._lag_task = asyncio.create_task(self._sample_loop_lag())
+        app = web.Application()
+        app.router.add_get('/metrics', self.handle_metrics)
+        app.router.add_get('/healthz', self.handle_health)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, METRICS_HOST, METRICS_PORT).start()
+        print(f"Serving metrics on {METRICS_HOST}:{METRICS_PORT}")
+
+    async def stop(self):
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            self._lag_task = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+class InstrumentedTree(app_commands.CommandTree):
+    """Times app commands from the pre-invoke check to completion or error."""
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        if METRICS_ENABLED:
+            interaction.extras['started_at'] = time.perf_counter()
+        return True
+
+    def record(self, interaction, failed=False):
+        started_at = interaction.extras.get('started_at')
+        if started_at is not None and interaction.command is not None:
+            self.client.metrics.observe('command', interaction.command.qualified_name, time.perf_counter() - started_at, failed)
+
+    async def on_error(self, interaction: discord.Interaction, error):
+        if METRICS_ENABLED:
+            self.record(interaction, failed=True)
+        await super().on_error(interaction, error)
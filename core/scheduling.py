@@ -0,0 +1,118 @@
+"""Deadline and debounce primitives for background work."""
+import asyncio
+import heapq
+import time
+from datetime import timedelta
+
+from core.utils import spawn
+
+class DeadlineScheduler:
+    """Runs ``callback(key)`` when each key's deadline passes, from a single task.
+
+    Deadlines live in a min-heap and the runner sleeps until the earliest one
+    (or until a sooner deadline is scheduled), so each wakeup only touches
+    keys that are actually due. Cancelled or rescheduled keys are skipped
+    lazily when their stale heap entry reaches the top.
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.deadlines = {}
+        self._heap = []
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._firing = set()
+
+    def schedule(self, key, due):
+        self.deadlines[key] = due
+        if not self._heap or due < self._heap[0][0]:
+            self._wakeup.set()
+        heapq.heappush(self._heap, (due, key))
+
+    def cancel(self, key):
+        self.deadlines.pop(key, None)
+        # Compact once stale heap entries outnumber live ones
+        if len(self._heap) > 2 * len(self.deadlines) + 64:
+            self._heap = [(due, k) for k, due in self.deadlines.items()]
+            heapq.heapify(self._heap)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _run(self):
+        while True:
+            while self._heap and self.deadlines.get(self._heap[0][1]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+            _, key = heapq.heappop(self._heap)
+            del self.deadlines[key]
+            spawn(self._firing, self._fire(key))
+
+    async def _fire(self, key):
+        try:
+            await self.callback(key)
+        except Exception as e:
+            print(f"Scheduled job {key!r} failed: {e}")
+
+TIME_UNITS = {'m': 60, 'h': 3600, 'd': 86400}
+MAX_RELATIVE_TIME = timedelta(days=365)
+
+def parse_relative_time(text):
+    """Parse '30m', '2h' or '1d' into a positive timedelta of at most MAX_RELATIVE_TIME.
+
+    Raises ValueError for anything else, including zero, negative and
+    out-of-range amounts.
+    """
+    text = text.strip().lower()
+    if len(text) < 2 or text[-1] not in TIME_UNITS:
+        raise ValueError(text)
+    seconds = int(text[:-1]) * TIME_UNITS[text[-1]]
+    # Checked before building the timedelta, which overflows on huge amounts
+    if not 0 < seconds <= MAX_RELATIVE_TIME.total_seconds():
+        raise ValueError(text)
+    return timedelta(seconds=seconds)
+
+class Debouncer:
+    """Coalesces repeated ``touch(key)`` calls into one ``callback(key)`` per delay window."""
+
+    def __init__(self, delay, callback):
+        self.delay = delay
+        self.callback = callback
+        self.pending = set()
+        self.running = set()
+        self._firing = set()
+
+    def touch(self, key):
+        if key not in self.pending:
+            self.pending.add(key)
+            asyncio.get_running_loop().call_later(self.delay, lambda: spawn(self._firing, self._fire(key)))
+
+    async def _fire(self, key):
+        self.pending.discard(key)
+        if key in self.running:
+            # Never run two updates for the same key at once; try again next window
+            self.touch(key)
+            return
+        self.running.add(key)
+        try:
+            await self.callback(key)
+        except Exception as e:
+            print(f"Debounced update for {key!r} failed: {e}")
+        finally:
+            self.running.discard(key)
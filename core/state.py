@@ -0,0 +1,320 @@
+"""Write-behind persistent state shared by every extension."""
+import abc
+import asyncio
+import json
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+
+from core.config import STATE_FLUSH_INTERVAL
+
+# Scope 0 holds state that is not tied to a guild and is loaded at startup.
+# Per-guild and per-user tables are scoped by the id in key[0]; guild and user
+# ids are both Discord snowflakes, so their scopes never collide.
+GLOBAL_SCOPE = 0
+
+def _encode_key(key):
+    return json.dumps(key)
+
+def _decode_key(raw):
+    key = json.loads(raw)
+    return tuple(key) if isinstance(key, list) else key
+
+class StorageBackend(abc.ABC):
+    """Blocking storage interface; the state store calls it off the event loop."""
+
+    @abc.abstractmethod
+    def load_scope(self, scope):
+        """Return (namespace, key, value) rows stored under a scope."""
+
+    @abc.abstractmethod
+    def load_namespace(self, namespace):
+        """Return (scope, key, value) rows stored under a namespace, across all scopes."""
+
+    @abc.abstractmethod
+    def write_batch(self, upserts, deletes):
+        """Apply (namespace, scope, key, value) upserts and (namespace, scope, key) deletes atomically."""
+
+    def close(self):
+        pass
+
+class MemoryBackend(StorageBackend):
+    def __init__(self, path=None):
+        self.rows = {}
+
+    def load_scope(self, scope):
+        return [(ns, key, value) for (ns, row_scope, key), value in self.rows.items() if row_scope == scope]
+
+    def load_namespace(self, namespace):
+        return [(scope, key, value) for (ns, scope, key), value in self.rows.items() if ns == namespace]
+
+    def write_batch(self, upserts, deletes):
+        for ns, scope, key, value in upserts:
+            self.rows[(ns, scope, key)] = value
+        for ns, scope, key in deletes:
+            self.rows.pop((ns, scope, key), None)
+
+class SQLiteBackend(StorageBackend):
+    def __init__(self, path):
+        self.path = path
+        self.writer = self._connect()
+        self.writer.execute(
+            "CREATE TABLE IF NOT EXISTS state ("
+            "scope INTEGER NOT NULL, namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+            "PRIMARY KEY (scope, namespace, key)) WITHOUT ROWID"
+        )
+        self.writer.commit()
+        # WAL lets lazy guild loads read while a batch is being written
+        self.reader = self._connect()
+        self.write_lock = threading.Lock()
+        self.read_lock = threading.Lock()
+
+    def _connect(self):
+        # Other cluster processes may hold the write lock briefly
+        conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def load_scope(self, scope):
+        with self.read_lock:
+            return self.reader.execute("SELECT namespace, key, value FROM state WHERE scope = ?", (scope,)).fetchall()
+
+    def load_namespace(self, namespace):
+        with self.read_lock:
+            return self.reader.execute("SELECT scope, key, value FROM state WHERE namespace = ?", (namespace,)).fetchall()
+
+    def write_batch(self, upserts, deletes):
+        with self.write_lock, self.writer:
+            self.writer.executemany(
+                "INSERT INTO state (namespace, scope, key, value) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (scope, namespace, key) DO UPDATE SET value = excluded.value",
+                upserts
+            )
+            self.writer.executemany("DELETE FROM state WHERE namespace = ? AND scope = ? AND key = ?", deletes)
+
+    def close(self):
+        self.writer.close()
+        self.reader.close()
+
+STATE_BACKENDS = {
+    'sqlite': SQLiteBackend,
+    'memory': MemoryBackend,
+}
+
+class PersistentDict(MutableMapping):
+    """Dict whose entries are written behind to the state store.
+
+    Assigning or deleting a key marks it dirty. Values mutated in place
+    (e.g. appending to a list) must be followed by ``save(key)``. Access
+    never blocks on storage: a scope that is not loaded yet reads as empty
+    while it loads in the background.
+    """
+
+    def __init__(self, store, namespace, scope_of, encode=None, decode=None):
+        self.store = store
+        self.namespace = namespace
+        self.scope_of = scope_of
+        self.encode = encode
+        self.decode = decode
+        self.data = {}
+
+    def __getitem__(self, key):
+        self.store.request_scope(self.scope_of(key))
+        return self.data[key]
+
+    def __contains__(self, key):
+        self.store.request_scope(self.scope_of(key))
+        return key in self.data
+
+    def __setitem__(self, key, value):
+        self.store.request_scope(self.scope_of(key))
+        self.data[key] = value
+        self.store.mark(self, key)
+
+    def __delitem__(self, key):
+        self.store.request_scope(self.scope_of(key))
+        del self.data[key]
+        self.store.mark(self, key)
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def save(self, key):
+        self.store.mark(self, key)
+
+class StateStore:
+    """Write-behind cache over a StorageBackend.
+
+    Mutations only mark keys dirty; a background task flushes them in one
+    transaction every STATE_FLUSH_INTERVAL seconds. Guild scopes are loaded
+    in the background after connecting, or on first access; callers that
+    must see a guild's stored state await load_scope() first. Tables are
+    registered by extensions as they load; rows read before their table
+    exists are held back and applied when it is registered.
+
+    Cluster processes share the backend but not their caches. Tables that
+    several clusters write for the same user are kept per user, and
+    refresh_scope() re-reads one user's rows before they are shown.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.tables = {}
+        self.loaded_scopes = set()
+        self._loading = {}
+        self._unclaimed = {}
+        self._dirty = set()
+        self._flushing = set()
+        self._flushes = 0
+        self._task = None
+
+    def table(self, namespace, per_guild=False, per_user=False, encode=None, decode=None):
+        # Reloaded extensions get their existing table back, data and all
+        if namespace in self.tables:
+            return self.tables[namespace]
+        scoped = per_guild or per_user
+        scope_of = (lambda key: key[0] if isinstance(key, tuple) else key) if scoped else (lambda key: GLOBAL_SCOPE)
+        table = self.tables[namespace] = PersistentDict(self, namespace, scope_of, encode, decode)
+        for raw_key, raw_value in self._unclaimed.pop(namespace, ()):
+            self._load_row(table, raw_key, raw_value)
+        return table
+
+    def _apply(self, scope, rows):
+        if scope in self.loaded_scopes:
+            return
+        self.loaded_scopes.add(scope)
+        for namespace, raw_key, raw_value in rows:
+            table = self.tables.get(namespace)
+            if table is None:
+                # Kept until an extension registers the table, which may happen after startup
+                self._unclaimed.setdefault(namespace, []).append((raw_key, raw_value))
+                continue
+            self._load_row(table, raw_key, raw_value)
+
+    def _load_row(self, table, raw_key, raw_value):
+        key = _decode_key(raw_key)
+        # Keys written before the scope finished loading are newer than the disk copy
+        if (table.namespace, key) not in self._dirty:
+            value = json.loads(raw_value)
+            table.data.setdefault(key, table.decode(value) if table.decode else value)
+
+    def request_scope(self, scope):
+        """Whether a scope is loaded; if not, start loading it in the background."""
+        if scope in self.loaded_scopes:
+            return True
+        if scope not in self._loading:
+            self._loading[scope] = asyncio.create_task(self._load(scope))
+        return False
+
+    async def load_scope(self, scope):
+        if scope in self.loaded_scopes:
+            return
+        self.request_scope(scope)
+        # Shielded so a cancelled caller does not abort a load others are waiting on
+        await asyncio.shield(self._loading[scope])
+        if scope not in self.loaded_scopes:
+            raise RuntimeError(f"Could not load state for scope {scope}")
+
+    async def _load(self, scope):
+        try:
+            rows = await asyncio.to_thread(self.backend.load_scope, scope)
+        except Exception as e:
+            print(f"Loading state for scope {scope} failed: {e}")
+            return
+        finally:
+            self._loading.pop(scope, None)
+        self._apply(scope, rows)
+
+    async def load_guilds(self, guild_ids):
+        for guild_id in guild_ids:
+            await self.load_scope(guild_id)
+
+    async def load_namespace(self, namespace):
+        """Load one registered table's rows from every scope, e.g. all users' reminders."""
+        table = self.tables[namespace]
+        rows = await asyncio.to_thread(self.backend.load_namespace, namespace)
+        for _, raw_key, raw_value in rows:
+            self._load_row(table, raw_key, raw_value)
+
+    async def refresh_scope(self, scope, known=()):
+        """Re-read a scope from storage to pick up rows other cluster processes wrote.
+
+        Stored rows replace cached values, and the (table, key) pairs in
+        ``known`` that are no longer stored are dropped from the cache; keys
+        with local changes not yet written keep their local state. Returns
+        {namespace: keys now cached under the scope}.
+        """
+        while True:
+            flushes = self._flushes
+            rows = await asyncio.to_thread(self.backend.load_scope, scope)
+            # A flush that finished during the read may have written rows the read missed
+            if flushes == self._flushes:
+                break
+        self._apply(scope, rows)
+        found = {}
+        for namespace, raw_key, raw_value in rows:
+            table = self.tables.get(namespace)
+            if table is None:
+                continue
+            key = _decode_key(raw_key)
+            found.setdefault(namespace, set()).add(key)
+            if not self._pending(namespace, key):
+                value = json.loads(raw_value)
+                table.data[key] = table.decode(value) if table.decode else value
+        for table, key in known:
+            keys = found.setdefault(table.namespace, set())
+            if key not in keys and not self._pending(table.namespace, key):
+                table.data.pop(key, None)
+            keys.add(key)
+        return {namespace: {key for key in keys if key in self.tables[namespace].data} for namespace, keys in found.items()}
+
+    def _pending(self, namespace, key):
+        return (namespace, key) in self._dirty or (namespace, key) in self._flushing
+
+    def mark(self, table, key):
+        self._dirty.add((table.namespace, key))
+
+    async def flush(self):
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+        upserts = []
+        deletes = []
+        for namespace, key in dirty:
+            table = self.tables[namespace]
+            scope = table.scope_of(key)
+            if key in table.data:
+                value = table.data[key]
+                if table.encode:
+                    value = table.encode(value)
+                upserts.append((namespace, scope, _encode_key(key), json.dumps(value)))
+            else:
+                deletes.append((namespace, scope, _encode_key(key)))
+        self._flushing |= dirty
+        try:
+            await asyncio.to_thread(self.backend.write_batch, upserts, deletes)
+        except Exception as e:
+            print(f"State flush failed, will retry: {e}")
+            self._dirty |= dirty
+        finally:
+            self._flushing -= dirty
+            self._flushes += 1
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(STATE_FLUSH_INTERVAL)
+            await self.flush()
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+        await self.flush()
+        self.backend.close()
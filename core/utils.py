@@ -0,0 +1,51 @@
+"""Small helpers used by several extensions."""
+import asyncio
+import os
+import string
+
+def current_rss():
+    """Resident set size in bytes, or None where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+def spawn(tasks, coro):
+    """Start a task and keep it in ``tasks`` until it finishes.
+
+    The event loop only holds weak references to tasks, so one nobody else
+    references can be garbage-collected while it is still running.
+    """
+    task = asyncio.create_task(coro)
+    tasks.add(task)
+    task.add_done_callback(tasks.discard)
+    return task
+
+async def guild_members(guild):
+    """A guild's full member list: the cache when it is complete, otherwise an uncached chunk.
+
+    Needs the members intent whenever the cache is incomplete.
+    """
+    if guild.chunked:
+        return guild.members
+    return await guild.chunk(cache=False)
+
+def role_ids(member):
+    return {role.id for role in member.roles if not role.is_default()}
+
+def compile_template(template, fields):
+    """Split a template into literal text and placeholder names, rejecting unknown placeholders."""
+    parts = []
+    try:
+        for literal, field, spec, conversion in string.Formatter().parse(template):
+            if literal:
+                parts.append((False, literal))
+            if field is None:
+                continue
+            if field not in fields or spec or conversion:
+                raise ValueError(f"Unknown placeholder {{{field}}}.")
+            parts.append((True, field))
+    except ValueError as e:
+        raise ValueError(f"Invalid template: {e}") from None
+    return tuple(parts)